@@ -1,8 +1,8 @@
-import sys, time, ctypes, psutil, traceback, platform, threading, os, winreg
+import sys, time, calendar, ctypes, psutil, traceback, platform, threading, os, winreg
 from ctypes import wintypes
 from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QFrame, QSystemTrayIcon, QMenu, QCheckBox
-from PySide6.QtGui import QColor, QPainter, QMouseEvent, QFont, QIcon, QAction, QPixmap
-from PySide6.QtCore import Qt, QTimer, QPoint, QLockFile, QStandardPaths, QDir, QSettings, QEvent
+from PySide6.QtGui import QColor, QPainter, QMouseEvent, QFont, QIcon, QAction, QPixmap, QImage
+from PySide6.QtCore import Qt, QTimer, QPoint, QLockFile, QStandardPaths, QDir, QSettings, QEvent, QObject, Signal
 
 APP_NAME = "PickerHost Monitor"
 ORG = "Pailant"
@@ -12,14 +12,21 @@ BASE_W, BASE_H, TITLE_H = 360, 260, 32
 SCAN_MS_MIN = 400
 SCAN_MS_NORMAL = 2000
 SCAN_MS_MAX = 15000
+SCAN_MS_SAFETY = SCAN_MS_MAX * 4  # safety-net poll while WMI events drive detection
 KILL_WAIT = 0.5
 RECHECK_MS = 300
-BACKOFF_STEP = 2000
 FAIL_BACKOFF_MAX = 12000
+WMI_EVENT_TIMEOUT_MS = 30000
+CREATE_TIME_SLACK = 1.0  # seconds; WMI CreationDate vs psutil create_time()
+RPC_E_CHANGED_MODE = -2147417850  # 0x80010106: thread already joined a different apartment
 RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
 
 IS_WINDOWS = platform.system() == "Windows"
 
+def _now_ms() -> int:
+    """Monotonic milliseconds; immune to wall-clock changes during cooldowns."""
+    return time.monotonic_ns() // 1_000_000
+
 # -------- Windows blur --------
 class ACCENT_POLICY(ctypes.Structure):
     _fields_ = [("AccentState", ctypes.c_int), ("AccentFlags", ctypes.c_int), ("GradientColor", ctypes.c_int), ("AnimationId", ctypes.c_int)]
@@ -35,22 +42,43 @@ def enable_blur(hwnd: int):
         pass
 
 # -------- Icons --------
+STATE_COLORS = ("grey", "green", "red", "orange", "blue")
 ICON_CACHE = {}
+_ICON_TEMPLATES: tuple[QImage, QImage] | None = None  # (disc alpha mask, black outline)
+
+def _icon_templates() -> tuple[QImage, QImage]:
+    """Rasterize the circle once; every colour is then a fill through the mask."""
+    global _ICON_TEMPLATES
+    if _ICON_TEMPLATES is None:
+        mask = QImage(32, 32, QImage.Format_ARGB32_Premultiplied); mask.fill(Qt.transparent)
+        ring = QImage(32, 32, QImage.Format_ARGB32_Premultiplied); ring.fill(Qt.transparent)
+        p = QPainter(mask); p.setRenderHint(QPainter.Antialiasing)
+        p.setBrush(Qt.black); p.setPen(Qt.black); p.drawEllipse(4, 4, 24, 24); p.end()
+        p = QPainter(ring); p.setRenderHint(QPainter.Antialiasing)
+        p.setBrush(Qt.NoBrush); p.setPen(Qt.black); p.drawEllipse(4, 4, 24, 24); p.end()
+        _ICON_TEMPLATES = (mask, ring)
+    return _ICON_TEMPLATES
+
 def make_icon(color: str) -> QIcon:
     ic = ICON_CACHE.get(color)
     if ic:
         return ic
-    pm = QPixmap(32, 32)
-    pm.fill(Qt.transparent)
-    p = QPainter(pm)
-    p.setRenderHint(QPainter.Antialiasing)
-    p.setBrush(QColor(color))
-    p.setPen(Qt.black)
-    p.drawEllipse(4, 4, 24, 24)
+    mask, ring = _icon_templates()
+    img = mask.copy()
+    p = QPainter(img)
+    p.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    p.fillRect(img.rect(), QColor(color))
+    p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+    p.drawImage(0, 0, ring)
     p.end()
-    ICON_CACHE[color] = QIcon(pm)
+    ICON_CACHE[color] = QIcon(QPixmap.fromImage(img))
     return ICON_CACHE[color]
 
+def build_icons():
+    """Fill ICON_CACHE for the whole state palette. QPixmap needs a live
+    QGuiApplication, so this runs from App.__init__ rather than at import."""
+    for c in STATE_COLORS: make_icon(c)
+
 # -------- Admin helpers --------
 def is_admin() -> bool:
     if not IS_WINDOWS: return False
@@ -68,58 +96,183 @@ def elevate():
         traceback.print_exc()
 
 # -------- Autostart --------
+_autostart_cached: bool | None = None  # cleared whenever set_autostart writes
+
 def is_autostart_enabled() -> bool:
+    global _autostart_cached
     if not IS_WINDOWS: return False
+    if _autostart_cached is not None: return _autostart_cached
     try:
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_READ) as key:
             val, _ = winreg.QueryValueEx(key, APP_NAME)
-            return bool(val)
+            _autostart_cached = bool(val)
     except Exception:
+        _autostart_cached = False
+    return _autostart_cached
+
+def register_autostart_batch(pairs: list[tuple[str, str | None]]) -> bool:
+    """Apply several Run-key values with one OpenKey; a None command removes the value.
+    Values that already match are left untouched."""
+    if not IS_WINDOWS: return False
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE | winreg.KEY_QUERY_VALUE) as key:
+            for name, cmd in pairs:
+                try:
+                    cur, _ = winreg.QueryValueEx(key, name)
+                except FileNotFoundError:
+                    cur = None
+                if cur == cmd: continue
+                if cmd is None:
+                    winreg.DeleteValue(key, name)
+                else:
+                    winreg.SetValueEx(key, name, 0, winreg.REG_SZ, cmd)
+        return True
+    except Exception as e:
+        print(f"[AutoStart ERROR] {e}")
         return False
 
 def set_autostart(enable: bool):
+    global _autostart_cached
     if not IS_WINDOWS: return
     exe_path = sys.executable
     script_path = os.path.abspath(sys.argv[0])
     cmd = f'"{exe_path}" "{script_path}"'
-    try:
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
-            if enable:
-                winreg.SetValueEx(key, APP_NAME, 0, winreg.REG_SZ, cmd)
-            else:
-                try:
-                    winreg.DeleteValue(key, APP_NAME)
-                except FileNotFoundError:
-                    pass
-    except Exception as e:
-        print(f"[AutoStart ERROR] {e}")
+    if register_autostart_batch([(APP_NAME, cmd if enable else None)]):
+        _autostart_cached = None
 
 # -------- Process helpers --------
-def find_pickerhost() -> psutil.Process | None:
-    try:
-        for proc in psutil.process_iter(["name"]):
+# PID-keyed caches so each tick only constructs Process objects for new PIDs,
+# plus a lower-cased name -> PIDs index for O(1) lookup by executable name
+_proc_cache: dict[int, psutil.Process] = {}
+_name_cache: dict[int, str] = {}
+_name_index: dict[str, list[int]] = {}
+# is_running() costs a Process construction per PID, so cached identities are
+# only re-checked for PID reuse on this slower cadence, not every tick
+PROC_REVALIDATE_S = 30.0
+_last_revalidate = 0.0
+
+def clear_proc_cache():
+    global _last_revalidate
+    _proc_cache.clear(); _name_cache.clear(); _name_index.clear()
+    _last_revalidate = 0.0
+
+def _forget_pid(pid: int):
+    _proc_cache.pop(pid, None)
+    name = _name_cache.pop(pid, None)
+    pids = _name_index.get(name)
+    if pids is not None:
+        try: pids.remove(pid)
+        except ValueError: pass
+        if not pids: del _name_index[name]
+
+def _refresh_index():
+    """Bring the caches in line with the live PID set; only new PIDs are named."""
+    global _last_revalidate
+    live = set(psutil.pids())
+    for pid in [pid for pid in _proc_cache if pid not in live]:
+        _forget_pid(pid)
+    now = time.monotonic()
+    if now - _last_revalidate >= PROC_REVALIDATE_S:
+        _last_revalidate = now
+        # is_running() compares create_time, so a PID reused by another process
+        # (possibly PickerHost.exe) is dropped here and re-named below. Matched
+        # PickerHost PIDs are re-checked every tick by _psutil_find_pid anyway.
+        for pid, cached in list(_proc_cache.items()):
+            if _name_cache.get(pid) == PROC_NAME: continue
             try:
-                n = proc.info.get("name")
-                if n and n.lower() == PROC_NAME:
-                    return proc
+                if cached.is_running(): continue
             except psutil.Error:
-                continue
+                pass
+            _forget_pid(pid)
+    for pid in live:
+        if pid in _proc_cache: continue
+        try:
+            p = psutil.Process(pid)
+        except psutil.Error:
+            continue
+        try:
+            name = p.name().lower()
+        except psutil.NoSuchProcess:
+            continue
+        except psutil.Error:
+            # e.g. access denied: remember it as unnamed so it is not retried every tick
+            name = ""
+        _proc_cache[pid] = p; _name_cache[pid] = name
+        _name_index.setdefault(name, []).append(pid)
+
+def _psutil_find_pid() -> int | None:
+    try:
+        _refresh_index()
     except psutil.Error:
         return None
+    for pid in list(_name_index.get(PROC_NAME, ())):
+        try:
+            if _proc_cache[pid].is_running(): return pid
+        except psutil.Error:
+            pass
+        # PID was reused since it was cached; re-index it on the next tick
+        _forget_pid(pid)
     return None
 
-def safe_kill(proc: psutil.Process) -> tuple[bool, str]:
+# -------- Toolhelp snapshot (Windows fast path) --------
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD), ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t), ("th32ModuleID", wintypes.DWORD), ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD), ("pcPriClassBase", wintypes.LONG), ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260)]
+
+if IS_WINDOWS:
+    _kernel32 = ctypes.windll.kernel32
+    _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.Process32FirstW.restype = wintypes.BOOL
+    _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    _kernel32.Process32NextW.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+
+def _snapshot_find_pid() -> int | None:
+    """One snapshot + in-process walk instead of opening a handle per PID."""
+    snap = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError()
     try:
-        proc.terminate()
+        pe = PROCESSENTRY32W(); pe.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        ok = _kernel32.Process32FirstW(snap, ctypes.byref(pe))
+        while ok:
+            if pe.szExeFile.lower() == PROC_NAME:
+                return pe.th32ProcessID
+            ok = _kernel32.Process32NextW(snap, ctypes.byref(pe))
+    finally:
+        _kernel32.CloseHandle(snap)
+    return None
+
+def find_pickerhost() -> int | None:
+    """Return the PID of the running PickerHost, or None."""
+    if IS_WINDOWS:
         try:
-            proc.wait(timeout=KILL_WAIT); return True, "terminated"
-        except psutil.TimeoutExpired:
+            return _snapshot_find_pid()
+        except OSError:
             pass
-        proc.kill()
-        try:
-            proc.wait(timeout=KILL_WAIT); return True, "killed"
-        except psutil.TimeoutExpired:
-            return False, "timeout"
+    return _psutil_find_pid()
+
+def safe_kill(proc: psutil.Process) -> tuple[bool, str]:
+    try:
+        with proc.oneshot():
+            proc.terminate()
+            try:
+                proc.wait(timeout=KILL_WAIT); return True, "terminated"
+            except psutil.TimeoutExpired:
+                pass
+            proc.kill()
+            try:
+                proc.wait(timeout=KILL_WAIT); return True, "killed"
+            except psutil.TimeoutExpired:
+                return False, "timeout"
     except psutil.NoSuchProcess:
         return True, "gone"
     except psutil.AccessDenied:
@@ -127,13 +280,35 @@ def safe_kill(proc: psutil.Process) -> tuple[bool, str]:
     except Exception as e:
         return False, f"error: {e}"
 
-# -------- WMI watcher (unchanged) --------
-class WMIWatcher:
-    def __init__(self, target_name: str, on_detect):
+# -------- WMI watcher --------
+def _cim_time(value) -> float:
+    """CIM_DATETIME ('yyyymmddHHMMSS.ffffff+UUU', offset in minutes) as Unix time; 0.0 if unparsable."""
+    try:
+        s = str(value)
+        t = calendar.timegm(time.strptime(s[:14], "%Y%m%d%H%M%S")) + float(s[14:21])
+        offset = int(s[22:25]) * 60
+        return t - offset if s[21] == "+" else t + offset
+    except (ValueError, IndexError, TypeError):
+        return 0.0
+
+class WMIWatcher(QObject):
+    # Emitted from the watcher thread; connect with Qt.QueuedConnection so the
+    # slots run on the GUI thread (QTimer.singleShot from a plain Python thread
+    # has no event loop to fire in).
+    detected = Signal(int, float)  # pid, creation time (0.0 if unknown)
+    vanished = Signal()
+    subscribed = Signal()  # ExecNotificationQuery succeeded, events are flowing
+    failed = Signal()      # connect/subscribe failed or the event query died
+    # SWbemServices connection shared across start()/stop() cycles. It lives in
+    # the MTA, so any later watcher thread that joins the MTA can reuse it.
+    _services = None
+    def __init__(self, target_name: str, timeout_ms: int = WMI_EVENT_TIMEOUT_MS, parent=None):
+        super().__init__(parent)
         self.target = target_name.lower()
-        self._on_detect = on_detect
+        self.timeout_ms = timeout_ms
         self._thread = None
-        self._running = False
+        self._stop_event: threading.Event | None = None
+        self._final = False
         self.available = False
         try:
             import pythoncom, win32com.client
@@ -142,34 +317,79 @@ class WMIWatcher:
             self.available = True
         except Exception:
             self.available = False
+    @property
+    def running(self) -> bool:
+        return self._stop_event is not None and not self._stop_event.is_set()
     def start(self):
-        if not self.available or self._running: return False
-        self._running = True
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        # True only means the thread was started; subscribed/failed report the outcome
+        if not self.available or self.running: return False
+        # Each run owns its stop event, so a thread still parked in NextEvent
+        # after stop() can never be revived by a later start()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), daemon=True)
         self._thread.start()
         return True
-    def stop(self):
-        self._running = False
-    def _run(self):
+    def stop(self, final: bool = False):
+        # NextEvent cannot be interrupted from another apartment; the thread
+        # exits when its current wait returns (at most timeout_ms later).
+        # final=True (app shutdown) also releases the shared connection and COM.
+        if final: self._final = True
+        if self._stop_event is not None: self._stop_event.set()
+    def _connect(self):
+        return self._win32.Dispatch("WbemScripting.SWbemLocator").ConnectServer(".", "root\\cimv2")
+    def _run(self, stop_event: threading.Event):
+        mta = True
         try:
-            self._pythoncom.CoInitialize()
-            wmi = self._win32.Dispatch("WbemScripting.SWbemLocator").ConnectServer(".", "root\\cimv2")
-            q = ("SELECT * FROM __InstanceCreationEvent WITHIN 1 "
-                 "WHERE TargetInstance ISA 'Win32_Process' "
-                 f"AND LCASE(TargetInstance.Name)='{self.target}'")
+            # MTA: this worker only talks to WMI, so it gains nothing from an STA message pump
+            try:
+                self._pythoncom.CoInitializeEx(self._pythoncom.COINIT_MULTITHREADED)
+            except self._pythoncom.com_error as e:
+                if e.hresult != RPC_E_CHANGED_MODE: raise
+                # Already an STA thread: stay there with a private, per-run connection
+                self._pythoncom.CoInitialize(); mta = False
+            if mta:
+                if WMIWatcher._services is None:
+                    WMIWatcher._services = self._connect()
+                wmi = WMIWatcher._services
+            else:
+                wmi = self._connect()
+            q = ("SELECT * FROM __InstanceOperationEvent WITHIN 1 "
+                 "WHERE (__CLASS='__InstanceCreationEvent' OR __CLASS='__InstanceDeletionEvent') "
+                 "AND TargetInstance ISA 'Win32_Process' "
+                 # WQL string comparison is already case-insensitive; LCASE() only
+                 # forced a per-candidate conversion on the provider side
+                 f"AND TargetInstance.Name='{self.target}'")
             watcher = wmi.ExecNotificationQuery(q)
-            while self._running:
+            self.subscribed.emit()
+            while not stop_event.is_set():
                 try:
-                    ev = watcher.NextEvent(2000)
-                    if ev is None: continue
-                    self._on_detect()
+                    ev = watcher.NextEvent(self.timeout_ms)
+                    if ev is None or stop_event.is_set(): continue
+                    if ev.SystemProperties_("__CLASS").Value == "__InstanceDeletionEvent":
+                        self.vanished.emit()
+                    else:
+                        # The event already carries the PID; no scan needed downstream
+                        proc = ev.TargetInstance
+                        self.detected.emit(int(proc.ProcessId), _cim_time(proc.CreationDate))
                 except Exception:
                     pass
         except Exception:
-            pass
+            # Drop a possibly broken connection (e.g. winmgmt restarted) so the next run reconnects
+            if mta: WMIWatcher._services = None
+            # Let the app fall back to normal polling; a stale stop event must not
+            # keep reporting running
+            stop_event.set()
+            if not self._final:
+                try: self.failed.emit()
+                except RuntimeError: pass  # QObject already destroyed on shutdown
         finally:
-            try: self._pythoncom.CoUninitialize()
-            except Exception: pass
+            # Leaving the MTA per stop() would tear down the shared proxy and
+            # reload the COM DLLs on the next start(); only do it on shutdown.
+            # The STA fallback owns nothing shared, so it always balances its init.
+            if self._final or not mta:
+                if mta: WMIWatcher._services = None
+                try: self._pythoncom.CoUninitialize()
+                except Exception: pass
 
 # -------- Mouse transparency --------
 GWL_EXSTYLE       = -20
@@ -186,18 +406,24 @@ def _get_set_window_long_funcs():
         GetWindowLongPtrW = user32.GetWindowLongW
     return GetWindowLongPtrW, SetWindowLongPtrW
 
+LONG_PTR = ctypes.c_ssize_t
+_GET_GWL, _SET_GWL = _get_set_window_long_funcs()
+if _GET_GWL is not None:
+    _GET_GWL.argtypes = [wintypes.HWND, ctypes.c_int]
+    _GET_GWL.restype = LONG_PTR
+    _SET_GWL.argtypes = [wintypes.HWND, ctypes.c_int, LONG_PTR]
+    _SET_GWL.restype = LONG_PTR
+
 def _set_transparent(hwnd: int, enable: bool):
     """Toggle WS_EX_TRANSPARENT for real hit-test pass-through."""
     if not IS_WINDOWS or not hwnd:
         return
-    user32 = ctypes.windll.user32
-    GetGWL, SetGWL = _get_set_window_long_funcs()
-    ex = GetGWL(hwnd, GWL_EXSTYLE)
+    ex = _GET_GWL(hwnd, GWL_EXSTYLE)
     if enable:
         ex |= WS_EX_TRANSPARENT
     else:
         ex &= ~WS_EX_TRANSPARENT
-    SetGWL(hwnd, GWL_EXSTYLE, ex)
+    _SET_GWL(hwnd, GWL_EXSTYLE, ex)
 
 # Poll Shift like Rainmeter’s “hold modifier to interact”
 VK_SHIFT = 0x10
@@ -209,6 +435,104 @@ def _is_shift_down() -> bool:
     except Exception:
         return False
 
+# Low-level keyboard hook: called only on key transitions instead of polling
+WH_KEYBOARD_LL = 13
+HC_ACTION = 0
+WM_KEYDOWN, WM_KEYUP, WM_SYSKEYDOWN, WM_SYSKEYUP = 0x0100, 0x0101, 0x0104, 0x0105
+VK_LSHIFT, VK_RSHIFT = 0xA0, 0xA1
+WM_QUIT = 0x0012
+LRESULT = ctypes.c_ssize_t
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [("vkCode", wintypes.DWORD), ("scanCode", wintypes.DWORD), ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+if IS_WINDOWS:
+    HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+    _user32 = ctypes.windll.user32
+    _user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+    _user32.SetWindowsHookExW.restype = wintypes.HHOOK
+    _user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+    _user32.CallNextHookEx.restype = LRESULT
+    _user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+    _user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+    _user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+    _user32.GetMessageW.restype = wintypes.BOOL
+    _user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    _user32.PostThreadMessageW.restype = wintypes.BOOL
+    _kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+    _kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+    _kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+class ShiftHook(QObject):
+    """Reports Shift down/up through changed(bool). The hook lives on its own
+    thread with its own GetMessage loop: a hook served by the GUI thread would
+    stall every keystroke system-wide while a kill or scan blocks it, and Windows
+    silently removes hooks that exceed LowLevelHooksTimeout."""
+    changed = Signal(bool)  # emitted from the hook thread; connect queued
+    failed = Signal()       # the hook thread's message loop ended unexpectedly
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+        self._thread_id = 0
+        self._proc = None  # keep the ctypes callback alive while hooked
+        self._held: set[int] = set()
+        self._stopping = False
+    def start(self, timeout: float = 2.0) -> bool:
+        if not IS_WINDOWS: return False
+        if self._thread is not None: return self._thread.is_alive()
+        installed = threading.Event(); result = []
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, args=(installed, result), daemon=True)
+        self._thread.start()
+        installed.wait(timeout)
+        if not result or not result[0]:
+            self._thread = None
+            return False
+        return True
+    def stop(self):
+        self._stopping = True
+        if self._thread is not None and self._thread_id:
+            try: _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            except Exception: pass
+            self._thread.join(1.0)
+        self._thread = None; self._thread_id = 0
+    def _run(self, installed: threading.Event, result: list):
+        hook = None
+        try:
+            self._thread_id = _kernel32.GetCurrentThreadId()
+            self._proc = HOOKPROC(self._callback)
+            hook = _user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._proc, _kernel32.GetModuleHandleW(None), 0)
+        except Exception:
+            hook = None
+        result.append(bool(hook)); installed.set()
+        if not hook:
+            self._proc = None; return
+        try:
+            msg = wintypes.MSG()
+            # 0 on WM_QUIT (stop), -1 on error
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            try: _user32.UnhookWindowsHookEx(hook)
+            except Exception: pass
+            self._proc = None
+            if not self._stopping:
+                try: self.failed.emit()
+                except RuntimeError: pass  # QObject already destroyed on shutdown
+    def _callback(self, n_code, w_param, l_param):
+        try:
+            if n_code == HC_ACTION:
+                vk = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents.vkCode
+                if vk in (VK_SHIFT, VK_LSHIFT, VK_RSHIFT):
+                    was_down = bool(self._held)
+                    if w_param in (WM_KEYDOWN, WM_SYSKEYDOWN): self._held.add(vk)
+                    elif w_param in (WM_KEYUP, WM_SYSKEYUP): self._held.discard(vk)
+                    if bool(self._held) != was_down: self.changed.emit(bool(self._held))
+        except Exception:
+            pass
+        return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
 # -------- UI bits --------
 class Lamp(QWidget):
     def __init__(self, color="grey", parent=None):
@@ -228,12 +552,16 @@ class App(QWidget):
         self.click_through_enabled = self.settings.value("click_through", False, type=bool)
         self.drag_off = QPoint()
         self.maxed = False
-        self.last_text = ""
-        self._last_tray_color = None
+        self._state = ("", None, None)  # (text, lamp, tray_color) last applied by set_state
+        self._tray_color = "grey"          # colour currently shown by the tray icon
+        self._pending_tray_color = None    # set while a _flush_tray is scheduled
         self.scan_interval = SCAN_MS_NORMAL
         self.fail_backoff_ms = 0
         self.cooldown_until_ms = 0
         self.shift_down = False
+        self._last_proc: psutil.Process | None = None
+        self._last_effective: bool | None = None  # click-through value last pushed to Qt/Win32
+        self._last_pid: int | None = None
 
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -276,8 +604,9 @@ class App(QWidget):
         root.addWidget(self.chkAutoStart, alignment=Qt.AlignCenter)
         root.addWidget(self.chkClickThrough, alignment=Qt.AlignCenter)
 
-        # Tray
-        self.tray = QSystemTrayIcon(make_icon("grey"), self)
+        # Tray (build the whole palette up front so ticks never draw icons)
+        build_icons()
+        self.tray = QSystemTrayIcon(ICON_CACHE["grey"], self)
         menu = QMenu()
         self.actShow = QAction("Show", self, triggered=self.show_normal)
         self.actToggle = QAction("", self, triggered=self.toggle_monitor_from_tray)
@@ -296,18 +625,27 @@ class App(QWidget):
         if IS_WINDOWS:
             QTimer.singleShot(0, lambda: enable_blur(self.winId().__int__()))
 
-        # WMI
-        self._wmi = WMIWatcher(PROC_NAME, on_detect=self._on_wmi_detect)
-        self.wmi_running = self._wmi.start()
+        # WMI: once events are flowing, the timer is only a slow safety net.
+        # Keep normal polling until the watcher confirms its subscription.
+        self.wmi_running = False
+        self._wmi = WMIWatcher(PROC_NAME, parent=self)
+        self._wmi.detected.connect(self._handle_detect, Qt.QueuedConnection)
+        self._wmi.vanished.connect(self._handle_vanish, Qt.QueuedConnection)
+        self._wmi.subscribed.connect(self._on_wmi_subscribed, Qt.QueuedConnection)
+        self._wmi.failed.connect(self._on_wmi_failed, Qt.QueuedConnection)
 
         self.timer = QTimer(self); self.timer.timeout.connect(self.tick); self.timer.start(self.scan_interval)
+        self._wmi.start()
         self.update_toggle_btn(); self.update_tray_toggle_text()
 
-        # Poll Shift ~30 Hz
-        self._shift_timer = QTimer(self)
-        self._shift_timer.setInterval(33)
-        self._shift_timer.timeout.connect(self._poll_shift)
-        self._shift_timer.start()
+        # Shift transitions from a low-level keyboard hook; poll ~30 Hz only if it can't run
+        self.shift_down = _is_shift_down()
+        self._shift_hook = ShiftHook(self)
+        self._shift_hook.changed.connect(self._set_shift, Qt.QueuedConnection)
+        self._shift_hook.failed.connect(self._start_shift_poll, Qt.QueuedConnection)
+        self._shift_timer = None
+        if not self._shift_hook.start():
+            self._start_shift_poll()
 
         self.installEventFilter(self)
         self._apply_click_through_state()
@@ -321,6 +659,18 @@ class App(QWidget):
         self.settings.setValue("click_through", self.click_through_enabled)
         self._apply_click_through_state()
 
+    def _start_shift_poll(self):
+        if self._shift_timer is not None: return
+        self._shift_timer = QTimer(self)
+        self._shift_timer.setInterval(33)
+        self._shift_timer.timeout.connect(self._poll_shift)
+        self._shift_timer.start()
+
+    def _set_shift(self, down: bool):
+        if down != self.shift_down:
+            self.shift_down = down
+            self._apply_click_through_state()
+
     def _poll_shift(self):
         new_state = _is_shift_down()
         if new_state != self.shift_down:
@@ -329,6 +679,8 @@ class App(QWidget):
 
     def _apply_click_through_state(self):
         effective = self.click_through_enabled and not self.shift_down
+        if effective == self._last_effective: return
+        self._last_effective = effective
         self.setAttribute(Qt.WA_TransparentForMouseEvents, effective)
         if IS_WINDOWS:
             _set_transparent(int(self.winId().__int__()), effective)
@@ -365,7 +717,7 @@ class App(QWidget):
         if self.maxed: self.showNormal(); self.maxed=False; self.btnMax.setText("⬜")
         else: self.showMaximized(); self.maxed=True; self.btnMax.setText("❐")
     def quit(self):
-        try: self._wmi.stop()
+        try: self._wmi.stop(final=True)
         except Exception: pass
         self.tray.hide(); QApplication.quit()
     def apply_scale(self, screen):
@@ -387,47 +739,91 @@ class App(QWidget):
     def toggle_monitor_from_tray(self): self.toggle_monitor()
     def toggle_autostart(self, state): set_autostart(state == Qt.Checked)
     def set_state(self, text: str, lamp: str, tray_color: str):
-        if text != self.last_text: self.status.setText(text); self.last_text = text
+        state = (text, lamp, tray_color)
+        if state == self._state: return
+        last_text, _, last_tray = self._state
+        self._state = state
+        if text != last_text: self.status.setText(text)
         self.lamp.set(lamp)
-        if tray_color != self._last_tray_color:
-            self.tray.setIcon(make_icon(tray_color)); self._last_tray_color = tray_color
+        if tray_color != last_tray:
+            # Coalesce tray updates within one event-loop turn into a single setIcon
+            if self._pending_tray_color is None: QTimer.singleShot(0, self._flush_tray)
+            self._pending_tray_color = tray_color
+    def _flush_tray(self):
+        color, self._pending_tray_color = self._pending_tray_color, None
+        if color is not None and color != self._tray_color:
+            self.tray.setIcon(ICON_CACHE[color]); self._tray_color = color
     def run_as_admin(self):
         if is_admin(): self.set_state("Already running as Administrator", "blue", "blue"); return
         elevate(); QTimer.singleShot(100, self.quit)
     def fix_now(self):
-        p = find_pickerhost()
-        if not p:
+        clear_proc_cache()
+        pid = find_pickerhost()
+        if pid is None:
             self._set_quiet(); self.set_state("PickerHost.exe not running", "green", "green"); return
-        ok, how = safe_kill(p)
+        ok, how = self._kill_pid(pid)
         if ok:
             self._set_burst(); self.set_state(f"PickerHost.exe {how} (manual)", "blue", "blue")
         else:
             self._set_fail_backoff(how)
-    def _on_wmi_detect(self):
-        QTimer.singleShot(0, self._handle_detect)
-    def _handle_detect(self):
+    def _proc_for(self, pid: int) -> psutil.Process:
+        """Reuse the Process built for the last detection while it is still the same process."""
+        p = self._last_proc
+        if p is not None and self._last_pid == pid:
+            try:
+                if p.is_running(): return p
+            except psutil.Error:
+                pass
+        self._last_proc = self._last_pid = None
+        p = psutil.Process(pid)
+        self._last_proc, self._last_pid = p, pid
+        return p
+    def _kill_pid(self, pid: int, created: float = 0.0) -> tuple[bool, str]:
+        try:
+            p = self._proc_for(pid)
+            # A reported PID may have been reused by the time it gets here: never
+            # terminate anything that is not the process that was detected
+            if (p.name().lower() != PROC_NAME
+                    or (created and abs(p.create_time() - created) > CREATE_TIME_SLACK)):
+                self._last_proc = self._last_pid = None
+                return True, "gone"
+        except psutil.NoSuchProcess:
+            return True, "gone"
+        except psutil.AccessDenied:
+            return False, "access denied"
+        except psutil.Error as e:
+            return False, f"error: {e}"
+        ok, how = safe_kill(p)
+        if ok: self._last_proc = self._last_pid = None
+        return ok, how
+    def _on_wmi_subscribed(self):
+        self.wmi_running = True; self._apply_interval(SCAN_MS_SAFETY)
+    def _on_wmi_failed(self):
+        self.wmi_running = False; self._apply_interval(SCAN_MS_NORMAL)
+    def _handle_vanish(self):
+        self._set_quiet(); self.set_state("PickerHost.exe not running", "green", "green")
+    def _handle_detect(self, pid: int, created: float = 0.0):
         if not self.monitoring:
             self.set_state("PickerHost.exe detected (not killing)", "orange", "orange"); return
-        p = find_pickerhost()
-        if not p:
+        ok, how = self._kill_pid(pid, created)
+        if how == "gone":
             self._set_quiet(); self.set_state("PickerHost.exe vanished", "green", "green"); return
-        ok, how = safe_kill(p)
         if ok:
             self._set_burst(); self.set_state("PickerHost.exe detected & auto-killed", "red", "red")
         else:
             self._set_fail_backoff(how)
     def tick(self):
-        now_ms = int(time.time()*1000)
+        now_ms = _now_ms()
         if now_ms < self.cooldown_until_ms: return
         if self.fail_backoff_ms:
             self.fail_backoff_ms -= self.scan_interval
             if self.fail_backoff_ms > 0: return
             self.fail_backoff_ms = 0
-        p = find_pickerhost()
-        if p:
+        pid = find_pickerhost()
+        if pid is not None:
             if not self.monitoring:
                 self._grow_quiet(); self.set_state("PickerHost.exe detected (not killing)", "orange", "orange"); return
-            ok, how = safe_kill(p)
+            ok, how = self._kill_pid(pid)
             if ok:
                 self._set_burst(); self.set_state("PickerHost.exe detected & auto-killed", "red", "red")
             else:
@@ -435,17 +831,18 @@ class App(QWidget):
         else:
             self._grow_quiet(); self.set_state("PickerHost.exe not running", "green", "green")
     def _apply_interval(self, ms: int):
-        ms = max(SCAN_MS_MIN, min(SCAN_MS_MAX, ms))
+        # Short-interval polling is only used when WMI events are unavailable
+        ms = SCAN_MS_SAFETY if self.wmi_running else max(SCAN_MS_MIN, min(SCAN_MS_MAX, ms))
         if ms != self.scan_interval:
             self.scan_interval = ms
             self.timer.setInterval(self.scan_interval)
     def _set_burst(self):
-        self.cooldown_until_ms = int(time.time()*1000) + RECHECK_MS
+        self.cooldown_until_ms = _now_ms() + RECHECK_MS
         self._apply_interval(SCAN_MS_MIN)
     def _set_quiet(self):
         self._apply_interval(SCAN_MS_NORMAL)
     def _grow_quiet(self):
-        self._apply_interval(min(SCAN_MS_MAX, self.scan_interval + BACKOFF_STEP))
+        self._apply_interval(min(SCAN_MS_MAX, self.scan_interval * 2))
     def _set_fail_backoff(self, how: str):
         if "access denied" in how and not is_admin():
             self.set_state("Access denied — try Run as Administrator", "orange", "orange")
@@ -454,8 +851,9 @@ class App(QWidget):
         self.fail_backoff_ms = min(FAIL_BACKOFF_MAX, max(1500, self.scan_interval * 2))
         self._apply_interval(min(self.scan_interval * 2, SCAN_MS_MAX))
     def _cleanup(self):
-        try: self._wmi.stop(); self.timer.stop()
+        try: self._wmi.stop(final=True); self.timer.stop()
         except Exception: pass
+        self._shift_hook.stop()
 
 # -------- Single instance lock --------
 def single_instance_lock():
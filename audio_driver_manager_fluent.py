@@ -18,19 +18,35 @@ Notes:
 import sys
 import os
 import json
+import time
+import locale
+import queue
+import uuid
+import base64
 import ctypes
+import shutil
+import functools
+import threading
 import subprocess
+from ctypes import wintypes
 from PySide6 import QtCore, QtGui, QtWidgets
 from sfc_tab import SFCTab
-from fluent_widgets import FluentButton, LogBox
+from fluent_widgets import FluentButton, LogBox, install_stylesheet, standard_icon
 from dism_tab import DISMTab
 
 
 APP_TITLE = "Audio Driver Manager — Fluent"
 IS_WINDOWS = (os.name == "nt")
+# DWMWA_SYSTEMBACKDROP_TYPE only exists from Windows 11 (build 22000); older DWM ignores it
+IS_WIN11 = IS_WINDOWS and sys.getwindowsversion().build >= 22000
+
+WM_DEVICECHANGE = 0x0219
+DBT_DEVNODES_CHANGED = 0x0007
 
 # ---- Elevation helpers ----
+@functools.lru_cache(maxsize=1)
 def is_admin() -> bool:
+    # The process token cannot gain or lose elevation, so ask shell32 once
     if not IS_WINDOWS:
         return False
     try:
@@ -38,18 +54,33 @@ def is_admin() -> bool:
     except Exception:
         return False
 
+NO_ELEVATE_FLAG = "--no-elevate"
+
+def _relaunch_elevated(executable: str | None = None) -> bool:
+    """
+    Start an elevated copy of this script via the "runas" verb.
+    The child gets --no-elevate so a declined or failed token check cannot loop.
+    Returns True if ShellExecuteW accepted the request.
+    """
+    args = list(sys.argv)
+    if NO_ELEVATE_FLAG not in args:
+        args.append(NO_ELEVATE_FLAG)
+    params = " ".join(['"%s"' % a for a in args])
+    rc = ctypes.windll.shell32.ShellExecuteW(None, "runas", executable or sys.executable, params, None, 1)
+    return rc > 32  # values <= 32 are ShellExecute error codes
+
 def relaunch_as_admin():
     if not IS_WINDOWS:
         return
     try:
-        params = " ".join(['"%s"' % a for a in sys.argv])
-        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, params, None, 1)
+        if not _relaunch_elevated():
+            raise OSError("ShellExecuteW refused the runas request")
     except Exception as e:
         QtWidgets.QMessageBox.critical(None, "Elevation failed", f"Could not relaunch as administrator:\n{e}")
 
 # ---- Windows 11 Mica Backdrop (best effort) ----
 def try_enable_mica(win_id):
-    if not IS_WINDOWS:
+    if not IS_WIN11:
         return
     try:
         DWMWA_SYSTEMBACKDROP_TYPE = 38  # Windows 11
@@ -74,10 +105,23 @@ def try_enable_mica(win_id):
         pass
 
 # ---- Command helpers ----
+# A GUI parent has no console, so without this each child would get its own conhost.exe
+_CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
+
+def _hidden_startupinfo():
+    """STARTUPINFO forcing SW_HIDE, for hosts that ignore CREATE_NO_WINDOW; None off Windows."""
+    if not IS_WINDOWS:
+        return None
+    si = subprocess.STARTUPINFO()
+    si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    si.wShowWindow = subprocess.SW_HIDE
+    return si
+
 def run_cmd(cmd: list[str] | str, use_shell=False):
     """Run a command and return (returncode, stdout, stderr)."""
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, shell=use_shell)
+        proc = subprocess.run(cmd, capture_output=True, text=True, shell=use_shell,
+                              creationflags=_CREATION_FLAGS, startupinfo=_hidden_startupinfo())
         return proc.returncode, proc.stdout, proc.stderr
     except Exception as e:
         return 1, "", str(e)
@@ -89,57 +133,359 @@ def run_powershell(ps_script: str):
     cmd = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script]
     return run_cmd(cmd)
 
-def list_audio_devices():
+class PowerShellHostDied(OSError):
+    """The host exited after a script was sent; its side effects may already have happened."""
+
+class PowerShellHost:
     """
-    Returns a list of dicts with keys: InstanceId, FriendlyName/Name, Status, Class
-    Combines classes: Media and AudioEndpoint
+    One long-lived PowerShell process that runs scripts fed over stdin, so each
+    call skips the ~1s profile/CLR cold start of a fresh powershell.exe.
+    Every script is sent base64-encoded on a single line (multi-line blocks then
+    parse as one statement) followed by a unique sentinel carrying a success flag;
+    output is read back up to that sentinel.
+    """
+    def __init__(self):
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        tag = uuid.uuid4().hex
+        self._end = f"<<END::{tag}>>"
+        self._err = f"<<ERR::{tag}>>"
+
+    def _start(self):
+        exe = shutil.which("pwsh") or "powershell"  # pwsh starts faster when installed
+        args = [exe, "-NoProfile", "-NoLogo", "-NonInteractive", "-ExecutionPolicy", "Bypass"]
+        if not exe.lower().endswith(("pwsh", "pwsh.exe")):
+            args.append("-MTA")
+        args += ["-Command", "-"]
+        self._proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, text=True, encoding="utf-8",
+                                      errors="replace", bufsize=1, creationflags=_CREATION_FLAGS,
+                                      startupinfo=_hidden_startupinfo())
+        self._send("[Console]::OutputEncoding = [System.Text.Encoding]::UTF8")
+
+    def _send(self, line: str):
+        self._proc.stdin.write(line + "\n")
+        self._proc.stdin.flush()
+
+    def stream(self, ps_script: str):
+        """
+        Generator yielding (is_error, line) while the script runs; its return
+        value is the returncode. Abandoning it mid-script kills the host, since
+        the unread output would otherwise leak into the next call.
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            b64 = base64.b64encode(ps_script.encode("utf-8")).decode("ascii")
+            self._send(
+                "$__ok = $true; try { "
+                f"& ([scriptblock]::Create([System.Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{b64}')))) 2>&1 | "
+                f"ForEach-Object {{ if ($_ -is [System.Management.Automation.ErrorRecord]) {{ '{self._err}' + $_ }} else {{ \"$_\" }} }} "
+                f"}} catch {{ '{self._err}' + $_.Exception.Message; $__ok = $false }}; '{self._end}' + [int]$__ok"
+            )
+            done = False
+            try:
+                for line in self._proc.stdout:
+                    line = line.rstrip("\r\n")
+                    if line.startswith(self._end):
+                        done = True
+                        return 0 if line[len(self._end):] == "1" else 1
+                    if line.startswith(self._err):
+                        yield True, line[len(self._err):]
+                    else:
+                        yield False, line
+                # Host exited mid-script; the next call starts a fresh one
+                raise PowerShellHostDied("PowerShell host exited while running the script")
+            finally:
+                if not done and self._proc is not None:
+                    self._proc.kill()
+                    self._proc = None
+
+    def invoke(self, ps_script: str):
+        """Run a script in the shared host and return (returncode, stdout, stderr)."""
+        out, err = [], []
+        lines = self.stream(ps_script)
+        while True:
+            try:
+                is_error, line = next(lines)
+            except StopIteration as stop:
+                return stop.value, "\n".join(out), "\n".join(err)
+            (err if is_error else out).append(line)
+
+    def close(self):
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+
+_ps_host: PowerShellHost | None = None
+_ps_host_lock = threading.Lock()
+
+def _powershell_host() -> PowerShellHost:
+    global _ps_host
+    with _ps_host_lock:
+        if _ps_host is None:
+            _ps_host = PowerShellHost()
+        return _ps_host
+
+def run_powershell_hosted(ps_script: str):
+    """Like run_powershell(), but reuses one warm PowerShell host per app."""
+    if not IS_WINDOWS:
+        return 1, "", "PowerShell not available on non-Windows"
+    try:
+        return _powershell_host().invoke(ps_script)
+    except PowerShellHostDied as e:
+        # Re-running could repeat side effects (e.g. cycle a device twice)
+        return 1, "", str(e)
+    except OSError:
+        # The host never started or the script never reached it: a one-shot is safe
+        return run_powershell(ps_script)
+
+def shutdown_powershell_host():
+    global _ps_host
+    with _ps_host_lock:
+        host, _ps_host = _ps_host, None
+    if host is not None:
+        host.close()
+
+# ---- Native SetupAPI / CfgMgr32 (no PowerShell) ----
+class GUID(ctypes.Structure):
+    _fields_ = [("Data1", wintypes.DWORD), ("Data2", wintypes.WORD),
+                ("Data3", wintypes.WORD), ("Data4", ctypes.c_ubyte * 8)]
+
+    @classmethod
+    def from_string(cls, text: str) -> "GUID":
+        u = uuid.UUID(text)
+        return cls(u.time_low, u.time_mid, u.time_hi_version, (ctypes.c_ubyte * 8)(*u.bytes[8:]))
+
+class SP_DEVINFO_DATA(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.DWORD), ("ClassGuid", GUID),
+                ("DevInst", wintypes.DWORD), ("Reserved", ctypes.c_size_t)]
+
+GUID_DEVCLASS_MEDIA = "{4d36e96c-e325-11ce-bfc1-08002be10318}"
+GUID_DEVCLASS_AUDIOENDPOINT = "{c166523c-fe0c-4a94-a586-f1a80cfbbf3e}"
+SPDRP_DEVICEDESC = 0x00000000
+SPDRP_CLASS = 0x00000007
+SPDRP_FRIENDLYNAME = 0x0000000C
+ERROR_INSUFFICIENT_BUFFER = 122
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+MAX_DEVICE_ID_LEN = 200
+CR_SUCCESS = 0x00
+CR_CALL_NOT_IMPLEMENTED = 0x34  # e.g. 32-bit Python on 64-bit Windows
+CM_LOCATE_DEVNODE_NORMAL = 0x0
+CM_DISABLE_UI_NOT_OK = 0x4
+DN_STARTED = 0x00000008
+DN_HAS_PROBLEM = 0x00000400
+
+_pnp_api_cache = None
+
+def _pnp_api():
+    """Load and prototype setupapi/cfgmgr32 once. Raises OSError if unavailable."""
+    global _pnp_api_cache
+    if _pnp_api_cache is None:
+        if not IS_WINDOWS:
+            raise OSError("SetupAPI not available on non-Windows")
+        sa = ctypes.WinDLL("setupapi", use_last_error=True)
+        cm = ctypes.WinDLL("cfgmgr32")
+        PDEVINFO = ctypes.POINTER(SP_DEVINFO_DATA)
+        PDWORD = ctypes.POINTER(wintypes.DWORD)
+        sa.SetupDiGetClassDevsW.argtypes = [ctypes.POINTER(GUID), wintypes.LPCWSTR, wintypes.HWND, wintypes.DWORD]
+        sa.SetupDiGetClassDevsW.restype = wintypes.HANDLE
+        sa.SetupDiEnumDeviceInfo.argtypes = [wintypes.HANDLE, wintypes.DWORD, PDEVINFO]
+        sa.SetupDiEnumDeviceInfo.restype = wintypes.BOOL
+        sa.SetupDiGetDeviceRegistryPropertyW.argtypes = [wintypes.HANDLE, PDEVINFO, wintypes.DWORD, PDWORD,
+                                                         ctypes.c_void_p, wintypes.DWORD, PDWORD]
+        sa.SetupDiGetDeviceRegistryPropertyW.restype = wintypes.BOOL
+        sa.SetupDiDestroyDeviceInfoList.argtypes = [wintypes.HANDLE]
+        sa.SetupDiDestroyDeviceInfoList.restype = wintypes.BOOL
+        cm.CM_Get_Device_IDW.argtypes = [wintypes.DWORD, wintypes.LPWSTR, wintypes.ULONG, wintypes.ULONG]
+        cm.CM_Get_DevNode_Status.argtypes = [PDWORD, PDWORD, wintypes.DWORD, wintypes.ULONG]
+        cm.CM_Locate_DevNodeW.argtypes = [PDWORD, wintypes.LPCWSTR, wintypes.ULONG]
+        cm.CM_Disable_DevNode.argtypes = [wintypes.DWORD, wintypes.ULONG]
+        cm.CM_Enable_DevNode.argtypes = [wintypes.DWORD, wintypes.ULONG]
+        cm.CM_Get_Parent.argtypes = [PDWORD, wintypes.DWORD, wintypes.ULONG]
+        for fn in (cm.CM_Get_Device_IDW, cm.CM_Get_DevNode_Status, cm.CM_Locate_DevNodeW,
+                   cm.CM_Disable_DevNode, cm.CM_Enable_DevNode, cm.CM_Get_Parent):
+            fn.restype = wintypes.DWORD  # CONFIGRET
+        _pnp_api_cache = (sa, cm)
+    return _pnp_api_cache
+
+def _device_property(sa, hdev, info, prop) -> str:
+    needed = wintypes.DWORD()
+    buf = ctypes.create_unicode_buffer(256)
+    if not sa.SetupDiGetDeviceRegistryPropertyW(hdev, ctypes.byref(info), prop, None,
+                                                buf, ctypes.sizeof(buf), ctypes.byref(needed)):
+        if ctypes.get_last_error() != ERROR_INSUFFICIENT_BUFFER:
+            return ""
+        buf = ctypes.create_unicode_buffer(needed.value // ctypes.sizeof(ctypes.c_wchar) + 1)
+        if not sa.SetupDiGetDeviceRegistryPropertyW(hdev, ctypes.byref(info), prop, None,
+                                                    buf, ctypes.sizeof(buf), None):
+            return ""
+    return buf.value
+
+def _devnode_status(cm, devinst) -> str:
+    """Map DevNode flags onto the Status strings Get-PnpDevice reports."""
+    status, problem = wintypes.DWORD(), wintypes.DWORD()
+    if cm.CM_Get_DevNode_Status(ctypes.byref(status), ctypes.byref(problem), devinst, 0) != CR_SUCCESS:
+        return "Unknown"  # not present
+    if status.value & DN_HAS_PROBLEM:
+        return "Error"
+    return "OK" if status.value & DN_STARTED else "Unknown"
+
+def list_audio_devices_native() -> list[dict]:
+    """
+    Enumerate the Media and AudioEndpoint classes straight from SetupAPI
+    (milliseconds, vs. ~1s of PowerShell start-up). Like Get-PnpDevice, this
+    includes non-present devices. Raises OSError if SetupAPI fails.
     """
-    ps = r"""
-$classes = @("Media", "AudioEndpoint")
-$devices = @()
-foreach ($c in $classes) {
+    sa, cm = _pnp_api()
+    devices = []
+    for class_guid in (GUID_DEVCLASS_MEDIA, GUID_DEVCLASS_AUDIOENDPOINT):
+        guid = GUID.from_string(class_guid)
+        hdev = sa.SetupDiGetClassDevsW(ctypes.byref(guid), None, None, 0)
+        if not hdev or hdev == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            index = 0
+            info = SP_DEVINFO_DATA()
+            info.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
+            while sa.SetupDiEnumDeviceInfo(hdev, index, ctypes.byref(info)):
+                index += 1
+                id_buf = ctypes.create_unicode_buffer(MAX_DEVICE_ID_LEN + 1)
+                if cm.CM_Get_Device_IDW(info.DevInst, id_buf, len(id_buf), 0) != CR_SUCCESS:
+                    continue
+                name = (_device_property(sa, hdev, info, SPDRP_FRIENDLYNAME)
+                        or _device_property(sa, hdev, info, SPDRP_DEVICEDESC))
+                devices.append({
+                    "InstanceId": id_buf.value,
+                    "Name": name or "(unnamed device)",
+                    "Status": _devnode_status(cm, info.DevInst),
+                    "Class": _device_property(sa, hdev, info, SPDRP_CLASS),
+                })
+        finally:
+            sa.SetupDiDestroyDeviceInfoList(hdev)
+    return devices
+
+def reset_device_native(instance_id: str):
+    """
+    Disable and then enable the device through CfgMgr32.
+    Returns (ok: bool, log: str); raises OSError when CfgMgr32 can't do it here.
+    """
+    _, cm = _pnp_api()
+    devinst = wintypes.DWORD()
+    cr = cm.CM_Locate_DevNodeW(ctypes.byref(devinst), instance_id, CM_LOCATE_DEVNODE_NORMAL)
+    if cr != CR_SUCCESS:
+        return False, f"Locate failed: CONFIGRET 0x{cr:X}"
+    lines = []
+    cr = cm.CM_Disable_DevNode(devinst, CM_DISABLE_UI_NOT_OK)
+    if cr == CR_CALL_NOT_IMPLEMENTED:
+        raise OSError("CM_Disable_DevNode not implemented for this process")
+    lines.append("Disable: OK" if cr == CR_SUCCESS else f"Disable failed: CONFIGRET 0x{cr:X}")
+    time.sleep(0.6)
+    cr = cm.CM_Enable_DevNode(devinst, 0)
+    ok = (cr == CR_SUCCESS)
+    lines.append("Enable: OK" if ok else f"Enable failed: CONFIGRET 0x{cr:X}")
+    return ok, "\n".join(lines)
+
+# One tab-separated line per device (InstanceId, Name, Status, Class), written as each is found
+LIST_DEVICES_PS = r"""
+foreach ($c in @("Media", "AudioEndpoint")) {
   try {
-    $d = Get-PnpDevice -Class $c -ErrorAction SilentlyContinue | Select-Object InstanceId, FriendlyName, Name, Status, Class
-    if ($d) { $devices += $d }
+    Get-PnpDevice -Class $c -ErrorAction SilentlyContinue | ForEach-Object {
+      $name = if ($_.FriendlyName) { $_.FriendlyName } else { $_.Name }
+      "{0}`t{1}`t{2}`t{3}" -f $_.InstanceId, $name, $_.Status, $_.Class
+    }
   } catch {}
 }
-$devices | ConvertTo-Json -Depth 3
 """
-    rc, out, err = run_powershell(ps)
+
+def _parse_device_line(line: str) -> dict | None:
+    parts = line.split("\t", 3)
+    if len(parts) != 4 or not parts[0]:
+        return None
+    inst, name, status, cls = parts
+    return {
+        "InstanceId": inst,
+        "Name": name or "(unnamed device)",
+        "Status": status,
+        "Class": cls,
+    }
+
+def list_audio_devices(on_device=None):
+    """
+    Returns a list of dicts with keys: InstanceId, FriendlyName/Name, Status, Class
+    Combines classes: Media and AudioEndpoint
+    Uses SetupAPI directly, falling back to PowerShell Get-PnpDevice.
+    on_device, if given, is called with each dict as the PowerShell fallback prints
+    it, so rows can be shown before Get-PnpDevice finishes. The native path is
+    effectively instant and only returns the full list.
+    """
+    if IS_WINDOWS:
+        try:
+            return list_audio_devices_native(), ""
+        except OSError:
+            pass
+    devices = []
+    try:
+        if not IS_WINDOWS:
+            raise OSError("PowerShell host not available on non-Windows")
+        errors = []
+        lines = _powershell_host().stream(LIST_DEVICES_PS)
+        while True:
+            try:
+                is_error, line = next(lines)
+            except StopIteration as stop:
+                rc = stop.value
+                break
+            if is_error:
+                errors.append(line)
+            elif (d := _parse_device_line(line)) is not None:
+                devices.append(d)
+                if on_device is not None:
+                    on_device(d)
+        err = "\n".join(errors)
+    except OSError:
+        # No warm host: one-shot spawn, parsed once it exits
+        devices.clear()
+        rc, out, err = run_powershell(LIST_DEVICES_PS)
+        devices.extend(d for d in map(_parse_device_line, out.splitlines()) if d is not None)
     if rc != 0:
         return [], f"PowerShell error listing devices: {err.strip()}"
-    try:
-        data = json.loads(out) if out.strip() else []
-        if isinstance(data, dict):
-            data = [data]
-        # Normalize fields
-        norm = []
-        for d in data:
-            norm.append({
-                "InstanceId": d.get("InstanceId"),
-                "Name": d.get("FriendlyName") or d.get("Name") or "(unnamed device)",
-                "Status": d.get("Status") or "",
-                "Class": d.get("Class") or "",
-            })
-        return norm, ""
-    except Exception as e:
-        return [], f"JSON parse error: {e}\nRaw: {out[:2000]}"
+    return devices, ""
 
 def reset_device(instance_id: str):
+    """
+    Disable and then enable the device via CfgMgr32, falling back to PowerShell.
+    Returns (ok: bool, log: str)
+    """
+    if IS_WINDOWS:
+        try:
+            return reset_device_native(instance_id)
+        except OSError:
+            pass
+    return reset_device_powershell(instance_id)
+
+def reset_device_powershell(instance_id: str):
     """
     Disable and then enable the device via PowerShell.
     Returns (ok: bool, log: str)
     """
+    inst = instance_id.replace("'", "''")
     ps = fr"""
-$inst = \"{instance_id}\"
+$inst = '{inst}'
 $err = $null
 try {{
   Disable-PnpDevice -InstanceId $inst -Confirm:$false -ErrorAction Stop | Out-Null
 }} catch {{ $err = $_.Exception.Message }}
 if ($err) {{
-  Write-Output (\"Disable failed: \" + $err)
+  Write-Output ('Disable failed: ' + $err)
 }} else {{
-  Write-Output \"Disable: OK\"
+  Write-Output 'Disable: OK'
 }}
 Start-Sleep -Milliseconds 600
 $err2 = $null
@@ -147,90 +493,339 @@ try {{
   Enable-PnpDevice -InstanceId $inst -Confirm:$false -ErrorAction Stop | Out-Null
 }} catch {{ $err2 = $_.Exception.Message }}
 if ($err2) {{
-  Write-Output (\"Enable failed: \" + $err2)
+  Write-Output ('Enable failed: ' + $err2)
 }} else {{
-  Write-Output \"Enable: OK\"
+  Write-Output 'Enable: OK'
 }}
 """
-    rc, out, err = run_powershell(ps)
+    rc, out, err = run_powershell_hosted(ps)
     ok = (rc == 0) and ("Enable: OK" in out)
     return ok, (out.strip() + ("\n" + err.strip() if err.strip() else ""))
 
-def reset_windows_audio_service():
-    """Run net stop/start audiosrv. Returns combined log text."""
-    steps = []
-    rc1, out1, err1 = run_cmd(["cmd", "/c", "net stop audiosrv"])
-    steps.append("> net stop audiosrv")
-    if out1.strip(): steps.append(out1.strip())
-    if err1.strip(): steps.append(err1.strip())
-    steps.append(f"Exit code: {rc1}")
-    rc2, out2, err2 = run_cmd(["cmd", "/c", "net start audiosrv"])
-    steps.append("> net start audiosrv")
-    if out2.strip(): steps.append(out2.strip())
-    if err2.strip(): steps.append(err2.strip())
-    steps.append(f"Exit code: {rc2}")
-    ok = (rc1 == 0 and rc2 == 0)
-    steps.append("✅ Audio service reset completed successfully." if ok else "⚠️ Audio service reset had errors.")
-    return "\n".join(steps), ok
+PROGRESS_PREFIX = "#PROGRESS#"
+
+RESET_POOL_SIZE = 4
+
+class _NativeResetTask(QtCore.QRunnable):
+    """One CfgMgr32 disable/enable; (instance_id, ok, message) always goes onto results, ok=None if refused."""
+    def __init__(self, instance_id: str, results: queue.Queue):
+        super().__init__()
+        self.setAutoDelete(False)  # the Python side owns it until the pool is done
+        self._inst = instance_id
+        self._results = results
+
+    def run(self):
+        try:
+            ok, out = reset_device_native(self._inst)
+        except OSError as e:
+            ok, out = None, str(e)
+        except Exception as e:
+            # Anything else still has to post a result, or the consumer blocks forever
+            ok, out = False, f"Reset failed: {e}"
+        self._results.put((self._inst, ok, out))
+
+def _devnode_ancestors(cm, instance_id: str) -> set[str]:
+    """Upper-cased instance ids of every parent devnode up to the root."""
+    devinst = wintypes.DWORD()
+    if cm.CM_Locate_DevNodeW(ctypes.byref(devinst), instance_id, CM_LOCATE_DEVNODE_NORMAL) != CR_SUCCESS:
+        return set()
+    ancestors = set()
+    id_buf = ctypes.create_unicode_buffer(MAX_DEVICE_ID_LEN)
+    parent = wintypes.DWORD()
+    while cm.CM_Get_Parent(ctypes.byref(parent), devinst, 0) == CR_SUCCESS:
+        if cm.CM_Get_Device_IDW(parent, id_buf, len(id_buf), 0) != CR_SUCCESS:
+            break
+        ancestors.add(id_buf.value.upper())
+        devinst = wintypes.DWORD(parent.value)
+    return ancestors
+
+def _reset_waves(pending: list[str]) -> list[list[str]]:
+    """
+    Split devices into waves that are safe to reset concurrently. A Media devnode
+    and the AudioEndpoint devnodes under it must not be cycled at the same time,
+    so each device waits for every selected ancestor: its wave is the number of
+    selected ancestors it has, which puts related devices in different waves.
+    """
+    _, cm = _pnp_api()
+    selected = {inst.upper() for inst in pending}
+    depth = {inst: len(_devnode_ancestors(cm, inst) & selected) for inst in pending}
+    return [[inst for inst in pending if depth[inst] == d] for d in sorted(set(depth.values()))]
+
+def _reset_native_parallel(pending: list[str]):
+    """
+    Reset devices on a bounded pool, wave by wave (see _reset_waves), yielding
+    results in completion order within a wave; ids CfgMgr32 refused are left in
+    pending for the PowerShell fallback.
+    """
+    results: queue.Queue = queue.Queue()
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(RESET_POOL_SIZE)
+    try:
+        for wave in _reset_waves(pending):
+            tasks = [_NativeResetTask(inst, results) for inst in wave]
+            for task in tasks:
+                pool.start(task)
+            for _ in tasks:
+                inst, ok, out = results.get()
+                if ok is None:
+                    continue
+                pending.remove(inst)
+                yield inst, ok, out
+            pool.waitForDone()
+    finally:
+        pool.waitForDone()
+
+def reset_devices_bulk(instance_ids: list[str]):
+    """
+    Disable and then enable every device, yielding (instance_id, ok, message)
+    as each one completes. Uses CfgMgr32 directly when it works, RESET_POOL_SIZE
+    unrelated devices at a time with parents before their children; otherwise runs
+    one PowerShell script for all devices instead of one spawn per device, and
+    devices the host never reported fall back to reset_device_powershell().
+    """
+    pending = list(instance_ids)
+    if IS_WINDOWS and pending:
+        try:
+            # The first device goes alone: it tells us whether CfgMgr32 works from this process
+            ok, out = reset_device_native(pending[0])
+            yield pending.pop(0), ok, out
+        except OSError:
+            pass
+        else:
+            yield from _reset_native_parallel(pending)
+    if not pending:
+        return
+    ids = ", ".join("'" + i.replace("'", "''") + "'" for i in pending)
+    ps = f"""
+foreach ($inst in @({ids})) {{
+  $msgs = @()
+  try {{
+    Disable-PnpDevice -InstanceId $inst -Confirm:$false -ErrorAction Stop | Out-Null
+    $msgs += 'Disable: OK'
+  }} catch {{ $msgs += ('Disable failed: ' + $_.Exception.Message) }}
+  Start-Sleep -Milliseconds 600
+  $ok = $true
+  try {{
+    Enable-PnpDevice -InstanceId $inst -Confirm:$false -ErrorAction Stop | Out-Null
+    $msgs += 'Enable: OK'
+  }} catch {{ $ok = $false; $msgs += ('Enable failed: ' + $_.Exception.Message) }}
+  '{PROGRESS_PREFIX}' + (@{{ InstanceId = $inst; Ok = $ok; Message = ($msgs -join "`n") }} | ConvertTo-Json -Compress)
+}}
+"""
+    if IS_WINDOWS:
+        try:
+            for is_error, line in _powershell_host().stream(ps):
+                if is_error or not line.startswith(PROGRESS_PREFIX):
+                    continue
+                try:
+                    d = json.loads(line[len(PROGRESS_PREFIX):])
+                except ValueError:
+                    continue
+                inst = d.get("InstanceId") or ""
+                if inst in pending:
+                    pending.remove(inst)
+                yield inst, bool(d.get("Ok")), d.get("Message") or ""
+        except OSError:
+            pass
+    for inst in pending:
+        ok, out = reset_device_powershell(inst)
+        yield inst, ok, out
+
+# net stop waits for the service to reach STOPPED before returning, unlike sc stop
+AUDIO_SERVICE_RESET_STEPS = (("net", ["stop", "audiosrv"]), ("net", ["start", "audiosrv"]))
+
+# ---- Native Service Control Manager (no net.exe) ----
+class SERVICE_STATUS(ctypes.Structure):
+    _fields_ = [("dwServiceType", wintypes.DWORD), ("dwCurrentState", wintypes.DWORD),
+                ("dwControlsAccepted", wintypes.DWORD), ("dwWin32ExitCode", wintypes.DWORD),
+                ("dwServiceSpecificExitCode", wintypes.DWORD), ("dwCheckPoint", wintypes.DWORD),
+                ("dwWaitHint", wintypes.DWORD)]
+
+AUDIO_SERVICE_NAME = "audiosrv"
+SC_MANAGER_CONNECT = 0x0001
+SERVICE_QUERY_STATUS = 0x0004
+SERVICE_START = 0x0010
+SERVICE_STOP = 0x0020
+SERVICE_CONTROL_STOP = 0x00000001
+SERVICE_STOPPED = 0x00000001
+SERVICE_RUNNING = 0x00000004
+ERROR_SERVICE_ALREADY_RUNNING = 1056
+ERROR_SERVICE_NOT_ACTIVE = 1062
+SERVICE_WAIT_TIMEOUT = 30.0
+
+_scm_api_cache = None
+
+def _scm_api():
+    """Load and prototype the advapi32 service functions once. Raises OSError if unavailable."""
+    global _scm_api_cache
+    if _scm_api_cache is None:
+        if not IS_WINDOWS:
+            raise OSError("Service Control Manager not available on non-Windows")
+        adv = ctypes.WinDLL("advapi32", use_last_error=True)
+        PSTATUS = ctypes.POINTER(SERVICE_STATUS)
+        adv.OpenSCManagerW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD]
+        adv.OpenSCManagerW.restype = wintypes.HANDLE
+        adv.OpenServiceW.argtypes = [wintypes.HANDLE, wintypes.LPCWSTR, wintypes.DWORD]
+        adv.OpenServiceW.restype = wintypes.HANDLE
+        adv.ControlService.argtypes = [wintypes.HANDLE, wintypes.DWORD, PSTATUS]
+        adv.ControlService.restype = wintypes.BOOL
+        adv.QueryServiceStatus.argtypes = [wintypes.HANDLE, PSTATUS]
+        adv.QueryServiceStatus.restype = wintypes.BOOL
+        adv.StartServiceW.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.c_void_p]
+        adv.StartServiceW.restype = wintypes.BOOL
+        adv.CloseServiceHandle.argtypes = [wintypes.HANDLE]
+        adv.CloseServiceHandle.restype = wintypes.BOOL
+        _scm_api_cache = adv
+    return _scm_api_cache
+
+def _wait_service_state(adv, hsvc, wanted: int, timeout: float) -> bool:
+    status = SERVICE_STATUS()
+    deadline = time.monotonic() + timeout
+    while True:
+        if not adv.QueryServiceStatus(hsvc, ctypes.byref(status)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        if status.dwCurrentState == wanted:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        # Same pacing the SCM documentation suggests: a tenth of the wait hint, within 0.1-1s
+        time.sleep(min(max(status.dwWaitHint / 10000.0, 0.1), 1.0))
+
+def restart_service_native(name: str = AUDIO_SERVICE_NAME, timeout: float = SERVICE_WAIT_TIMEOUT):
+    """
+    Stop and start a service through the SCM, waiting for each state change.
+    Yields log lines and returns ok (as the generator's return value);
+    raises OSError when the SCM or the service can't be opened.
+    """
+    adv = _scm_api()
+    hscm = adv.OpenSCManagerW(None, None, SC_MANAGER_CONNECT)
+    if not hscm:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        hsvc = adv.OpenServiceW(hscm, name, SERVICE_STOP | SERVICE_START | SERVICE_QUERY_STATUS)
+        if not hsvc:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            status = SERVICE_STATUS()
+            yield f"> stop {name}"
+            if adv.ControlService(hsvc, SERVICE_CONTROL_STOP, ctypes.byref(status)):
+                if not _wait_service_state(adv, hsvc, SERVICE_STOPPED, timeout):
+                    yield f"Timed out waiting for {name} to stop."
+                    return False
+                yield "Stopped."
+            elif ctypes.get_last_error() == ERROR_SERVICE_NOT_ACTIVE:
+                yield "Service was not running."
+            else:
+                yield f"Stop failed: {ctypes.FormatError(ctypes.get_last_error())}"
+                return False
+            yield f"> start {name}"
+            if not adv.StartServiceW(hsvc, 0, None):
+                err = ctypes.get_last_error()
+                if err != ERROR_SERVICE_ALREADY_RUNNING:
+                    yield f"Start failed: {ctypes.FormatError(err)}"
+                    return False
+            if not _wait_service_state(adv, hsvc, SERVICE_RUNNING, timeout):
+                yield f"Timed out waiting for {name} to start."
+                return False
+            yield "Running."
+            return True
+        finally:
+            adv.CloseServiceHandle(hsvc)
+    finally:
+        adv.CloseServiceHandle(hscm)
+
+# ---- Background workers ----
+class PnpWorker(QtCore.QThread):
+    """Enumerates audio devices off the UI thread. device_found streams rows
+    as they are parsed; devices_ready carries the complete list at the end."""
+    device_found = QtCore.Signal(dict)
+    devices_ready = QtCore.Signal(list, str)
+
+    def run(self):
+        devices, err = list_audio_devices(self.device_found.emit)
+        self.devices_ready.emit(devices, err)
+
+class ServiceResetWorker(QtCore.QThread):
+    """Restarts the audio service through the SCM. done(ok, handled) reports
+    handled=False when the native path is unavailable and net.exe should run instead."""
+    log_line = QtCore.Signal(str)
+    done = QtCore.Signal(bool, bool)
+
+    def run(self):
+        gen = restart_service_native()
+        try:
+            while True:
+                self.log_line.emit(next(gen))
+        except StopIteration as stop:
+            self.done.emit(bool(stop.value), True)
+        except OSError as e:
+            self.log_line.emit(f"Service Control Manager: {e}")
+            self.done.emit(False, False)
+
+class ResetAllWorker(QtCore.QThread):
+    """Disables/enables each device, streaming log lines. Lists devices first
+    unless an already known list is passed in."""
+    log_line = QtCore.Signal(str)
+
+    def __init__(self, devices: list[dict] | None = None, parent=None):
+        super().__init__(parent)
+        self._devices = devices
+
+    def run(self):
+        devices = self._devices
+        if devices is None:
+            devices, err = list_audio_devices()
+            if err:
+                self.log_line.emit(err)
+                return
+        if not devices:
+            self.log_line.emit("No audio devices found.")
+            return
+        names = {d.get("InstanceId", ""): d.get("Name", "(unnamed)") for d in devices}
+        for inst, ok, out in reset_devices_bulk(list(names)):
+            self.log_line.emit(f"[{names.get(inst, '(unnamed)')}]")
+            self.log_line.emit(f"  InstanceId: {inst}")
+            for line in out.splitlines():
+                self.log_line.emit("  " + line)
+            self.log_line.emit(f"  Result: {'OK' if ok else 'FAILED'}\n")
+        self.log_line.emit("=== Reset ALL finished ===\n")
 
 # ---- UI widgets ----
-class FluentButton(QtWidgets.QPushButton):
-    def __init__(self, text="", icon: QtGui.QIcon | None = None, *args, **kwargs):
-        super().__init__(text, *args, **kwargs)
-        if icon:
-            self.setIcon(icon)
-        self.setCursor(QtCore.Qt.PointingHandCursor)
-        self.setMinimumHeight(40)
-        self.setStyleSheet("""
-            QPushButton {
-                background: rgba(0,0,0,0.04);
-                border: 1px solid rgba(0,0,0,0.08);
-                border-radius: 12px;
-                padding: 8px 14px;
-                font-size: 12.5pt;
-            }
-            QPushButton:hover { background: rgba(0,0,0,0.07); }
-            QPushButton:pressed { background: rgba(0,0,0,0.12); }
-            QPushButton:disabled {
-                background: rgba(0,0,0,0.02);
-                color: rgba(0,0,0,0.4);
-            }
-        """)
+# FluentButton comes from fluent_widgets; its QSS is part of the app stylesheet
+# Installed once on MainWindow; StatusChip only flips its chipOk property
+STATUS_CHIP_QSS = """
+    QLabel#StatusChip {
+        border-radius: 10px;
+        padding: 4px 10px;
+        font: 10pt "Segoe UI";
+    }
+    QLabel#StatusChip[chipOk="true"] {
+        color: #0F5132;
+        background: #D1E7DD;
+        border: 1px solid #BADBCC;
+    }
+    QLabel#StatusChip[chipOk="false"] {
+        color: #664D03;
+        background: #FFF3CD;
+        border: 1px solid #FFE69C;
+    }
+"""
 
 class StatusChip(QtWidgets.QLabel):
     def __init__(self, text, ok=True, parent=None):
         super().__init__(text, parent)
+        self.setObjectName("StatusChip")
         self.setAlignment(QtCore.Qt.AlignCenter)
         self.setMargin(6)
-        self.setStyleSheet(f"""
-            QLabel {{
-                border-radius: 10px;
-                padding: 4px 10px;
-                color: {'#0F5132' if ok else '#664D03'};
-                background: {'#D1E7DD' if ok else '#FFF3CD'};
-                border: 1px solid {'#BADBCC' if ok else '#FFE69C'};
-                font: 10pt "Segoe UI";
-            }}
-        """)
-
-class LogBox(QtWidgets.QPlainTextEdit):
-    def __init__(self):
-        super().__init__()
-        self.setReadOnly(True)
-        self.setLineWrapMode(QtWidgets.QPlainTextEdit.WidgetWidth)
-        self.setStyleSheet("""
-            QPlainTextEdit {
-                background: rgba(255,255,255,0.7);
-                border: 1px solid rgba(0,0,0,0.08);
-                border-radius: 12px;
-                padding: 10px;
-                font: 10.5pt "Consolas";
-            }
-        """)
-
-    def append_line(self, text: str):
-        self.appendPlainText(text)
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.setProperty("chipOk", bool(ok))
+
+    def set_ok(self, ok: bool):
+        if self.property("chipOk") == ok:
+            return
+        self.setProperty("chipOk", ok)
+        # Property selectors are only re-evaluated on polish
+        self.style().unpolish(self)
+        self.style().polish(self)
 
 class DevicesTable(QtWidgets.QTableWidget):
     def __init__(self):
@@ -243,19 +838,55 @@ class DevicesTable(QtWidgets.QTableWidget):
         self.setAlternatingRowColors(True)
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
-        self.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
-        self.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeToContents)
-        self.horizontalHeader().setSectionResizeMode(3, QtWidgets.QHeaderView.ResizeToContents)
+        # Interactive instead of ResizeToContents: the latter rescans the column on every setItem.
+        # load_devices sizes them once after a batch.
+        for col in (1, 2, 3):
+            self.horizontalHeader().setSectionResizeMode(col, QtWidgets.QHeaderView.Interactive)
+        # Items are kept across refreshes and only re-texted; row i of the pool is table row i
+        self._row_items: list[tuple[QtWidgets.QTableWidgetItem, ...]] = []
+        self._stream_row = 0
+
+    COLUMNS = ("Name", "Status", "Class", "InstanceId")
+
+    def _set_row(self, row: int, d: dict):
+        if row == len(self._row_items):
+            if self.rowCount() <= row:
+                self.setRowCount(row + 1)
+            items = tuple(QtWidgets.QTableWidgetItem() for _ in self.COLUMNS)
+            for col, item in enumerate(items):
+                self.setItem(row, col, item)
+            self._row_items.append(items)
+        for item, key in zip(self._row_items[row], self.COLUMNS):
+            item.setText(d.get(key, ""))
+
+    def _truncate(self, count: int):
+        # setRowCount deletes the dropped items, so forget them first
+        del self._row_items[count:]
+        self.setRowCount(count)
+
+    def begin_stream(self):
+        """Start overwriting rows from the top; load_devices() trims what is left over."""
+        self._stream_row = 0
+
+    @QtCore.Slot(dict)
+    def append_device(self, d: dict):
+        self._set_row(self._stream_row, d)
+        self._stream_row += 1
 
     def load_devices(self, devices: list[dict]):
-        self.setRowCount(0)
-        for d in devices:
-            row = self.rowCount()
-            self.insertRow(row)
-            self.setItem(row, 0, QtWidgets.QTableWidgetItem(d.get("Name","")))
-            self.setItem(row, 1, QtWidgets.QTableWidgetItem(d.get("Status","")))
-            self.setItem(row, 2, QtWidgets.QTableWidgetItem(d.get("Class","")))
-            self.setItem(row, 3, QtWidgets.QTableWidgetItem(d.get("InstanceId","")))
+        sorting = self.isSortingEnabled()
+        self.setUpdatesEnabled(False)
+        self.setSortingEnabled(False)
+        try:
+            self._truncate(min(len(devices), len(self._row_items)))
+            for row, d in enumerate(devices):
+                self._set_row(row, d)
+            self._stream_row = 0
+            for col in (1, 2, 3):
+                self.resizeColumnToContents(col)
+        finally:
+            self.setSortingEnabled(sorting)
+            self.setUpdatesEnabled(True)
 
 
 
@@ -267,7 +898,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle(APP_TITLE)
         self.resize(980, 640)
         self.setMinimumSize(820, 520)
-        self.setWindowIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaVolume))
+        self.setWindowIcon(standard_icon(QtWidgets.QStyle.SP_MediaVolume))
+        self.setStyleSheet(STATUS_CHIP_QSS)
 
         # ---------------- Tabs ----------------
         tabs = QtWidgets.QTabWidget()
@@ -285,22 +917,31 @@ class MainWindow(QtWidgets.QMainWindow):
         subtitle = QtWidgets.QLabel("List & reset all audio devices • Also reset Windows Audio service")
         subtitle.setStyleSheet('font: 10.5pt "Segoe UI"; color: #555; margin-bottom: 8px;')
 
-        self.btn_refresh = FluentButton("List Audio Devices", self.style().standardIcon(QtWidgets.QStyle.SP_BrowserReload))
+        self.btn_refresh = FluentButton("List Audio Devices", standard_icon(QtWidgets.QStyle.SP_BrowserReload))
         self.btn_refresh.clicked.connect(self.on_refresh)
 
-        self.btn_reset_all = FluentButton("Reset ALL Devices", self.style().standardIcon(QtWidgets.QStyle.SP_MediaSkipForward))
+        self.btn_reset_all = FluentButton("Reset ALL Devices", standard_icon(QtWidgets.QStyle.SP_MediaSkipForward))
         self.btn_reset_all.clicked.connect(self.on_reset_all)
 
-        self.btn_reset_service = FluentButton("Reset Windows Audio Service", self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+        self.btn_reset_service = FluentButton("Reset Windows Audio Service", standard_icon(QtWidgets.QStyle.SP_MediaPlay))
         self.btn_reset_service.clicked.connect(self.on_reset_service)
 
-        self.btn_admin = FluentButton("Run as Administrator", self.style().standardIcon(QtWidgets.QStyle.SP_DialogYesButton))
+        self.btn_admin = FluentButton("Run as Administrator", standard_icon(QtWidgets.QStyle.SP_DialogYesButton))
         self.btn_admin.clicked.connect(relaunch_as_admin)
 
-        self.chip = StatusChip("Admin: YES" if is_admin() else "Admin: NO", ok=is_admin())
+        admin = is_admin()
+        self.chip = StatusChip("Admin: YES" if admin else "Admin: NO", ok=admin)
 
         self.table = DevicesTable()
         self.log = LogBox()
+        self._pnp_worker: PnpWorker | None = None
+        self._reset_worker: ResetAllWorker | None = None
+        # Last enumeration; dropped on WM_DEVICECHANGE/DBT_DEVNODES_CHANGED
+        self._device_cache: list[dict] | None = None
+        self._service_worker: ServiceResetWorker | None = None
+        self._service_proc: QtCore.QProcess | None = None
+        self._service_steps: list[tuple[str, list[str]]] = []
+        self._service_ok = True
 
         # Layout for Audio Manager tab
         top_row = QtWidgets.QHBoxLayout()
@@ -322,7 +963,6 @@ class MainWindow(QtWidgets.QMainWindow):
         v.addWidget(self.log, 2)
 
         # ---- Tab 2: SFC/SCANNOW ----
-        from sfc_tab import SFCTab
         self.sfc_tab = SFCTab()
         tabs.addTab(self.sfc_tab, "SFC /SCANNOW")
         self.dism_tab = DISMTab()
@@ -334,10 +974,8 @@ class MainWindow(QtWidgets.QMainWindow):
         footer.setStyleSheet('font: 9pt "Segoe UI"; color: #666; margin-top: 6px;')
         central_layout.addWidget(footer)
 
-        # Try Mica on Win11
-        if IS_WINDOWS:
-            self.show()
-            QtCore.QTimer.singleShot(150, lambda: try_enable_mica(self.winId()))
+        # Mica is applied from the first showEvent, before anything is painted
+        self._mica_applied = False
 
         # Light palette
         pal = self.palette()
@@ -352,34 +990,133 @@ class MainWindow(QtWidgets.QMainWindow):
     def update_chip(self):
         admin = is_admin()
         self.chip.setText("Admin: YES" if admin else "Admin: NO")
-        self.chip.setStyleSheet(f"""
-            QLabel {{
-                border-radius: 10px;
-                padding: 4px 10px;
-                color: {'#0F5132' if admin else '#664D03'};
-                background: {'#D1E7DD' if admin else '#FFF3CD'};
-                border: 1px solid {'#BADBCC' if admin else '#FFE69C'};
-                font: 10pt "Segoe UI";
-            }}
-        """)
+        self.chip.set_ok(admin)
 
     def on_refresh(self):
+        if self._pnp_worker is not None:
+            return
+        self.btn_refresh.setEnabled(False)
         self.log.append_line("Listing audio devices (Media, AudioEndpoint)...")
-        devices, err = list_audio_devices()
+        self.table.begin_stream()
+        self._pnp_worker = PnpWorker(self)
+        self._pnp_worker.device_found.connect(self.table.append_device)
+        self._pnp_worker.devices_ready.connect(self._apply_devices)
+        # devices_ready is emitted before run() returns: clear the reference, so
+        # closeEvent still waits, only once the thread has actually finished
+        self._pnp_worker.finished.connect(self._on_pnp_worker_finished)
+        self._pnp_worker.finished.connect(self._pnp_worker.deleteLater)
+        self._pnp_worker.start()
+
+    @QtCore.Slot()
+    def _on_pnp_worker_finished(self):
+        self._pnp_worker = None
+        self.btn_refresh.setEnabled(True)
+
+    @QtCore.Slot(list, str)
+    def _apply_devices(self, devices: list, err: str):
         if err:
             self.log.append_line(err)
         else:
             self.log.append_line(f"Found {len(devices)} device(s).")
+            self._device_cache = devices
         self.table.load_devices(devices)
 
+    def list_audio_devices_cached(self) -> list[dict] | None:
+        """The last device list, or None once a device change has invalidated it (see nativeEvent)."""
+        return self._device_cache
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        if not self._mica_applied:
+            self._mica_applied = True
+            try_enable_mica(self.winId())
+        super().showEvent(event)
+
+    def nativeEvent(self, event_type, message):
+        # Top-level windows receive the DBT_DEVNODES_CHANGED broadcast without registration
+        if IS_WINDOWS and event_type == b"windows_generic_MSG":
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == WM_DEVICECHANGE and msg.wParam == DBT_DEVNODES_CHANGED:
+                self._device_cache = None
+        return super().nativeEvent(event_type, message)
+
     def on_reset_service(self):
         if not IS_WINDOWS:
             QtWidgets.QMessageBox.critical(self, "Unsupported OS", "This tool requires Windows.")
             return
+        if self._service_proc is not None or self._service_worker is not None:
+            return
+        self.btn_reset_service.setEnabled(False)
         self.log.append_line("=== Resetting Windows Audio service ===")
-        text, ok = reset_windows_audio_service()
-        for line in text.splitlines():
-            self.log.append_line(line)
+        worker = ServiceResetWorker(self)
+        worker.log_line.connect(self.log.append_line)
+        worker.done.connect(self._on_service_worker_done)
+        # done is emitted before run() returns: keep the reference, so closeEvent
+        # still waits, until the thread has actually finished
+        worker.finished.connect(self._on_service_worker_finished)
+        worker.finished.connect(worker.deleteLater)
+        self._service_worker = worker
+        worker.start()
+
+    @QtCore.Slot()
+    def _on_service_worker_finished(self):
+        self._service_worker = None
+
+    @QtCore.Slot(bool, bool)
+    def _on_service_worker_done(self, ok: bool, handled: bool):
+        if handled:
+            self.log.append_line("✅ Audio service reset completed successfully." if ok
+                                 else "⚠️ Audio service reset had errors.")
+            self.btn_reset_service.setEnabled(True)
+            return
+        # SCM unreachable from this process: fall back to the net.exe chain
+        self._service_steps = list(AUDIO_SERVICE_RESET_STEPS)
+        self._service_ok = True
+        self._start_next_service_step()
+
+    def _start_next_service_step(self):
+        """Run the next net.exe step via QProcess; each finished signal chains the next."""
+        if not self._service_steps:
+            self._service_proc = None
+            self.log.append_line("✅ Audio service reset completed successfully." if self._service_ok
+                                 else "⚠️ Audio service reset had errors.")
+            self.btn_reset_service.setEnabled(True)
+            return
+        program, args = self._service_steps.pop(0)
+        self.log.append_line(f"> {program} {' '.join(args)}")
+        proc = QtCore.QProcess(self)
+        proc.setProcessChannelMode(QtCore.QProcess.ProcessChannelMode.MergedChannels)
+        proc.readyReadStandardOutput.connect(self._on_service_output)
+        proc.finished.connect(self._on_service_step_finished)
+        proc.errorOccurred.connect(self._on_service_error)
+        self._service_proc = proc
+        proc.start(program, args)
+
+    @QtCore.Slot()
+    def _on_service_output(self):
+        if not self._service_proc:
+            return
+        data = self._service_proc.readAllStandardOutput().data()
+        for line in data.decode(locale.getpreferredencoding(False), errors="replace").splitlines():
+            if line.strip():
+                self.log.append_line(line.strip())
+
+    @QtCore.Slot(int, QtCore.QProcess.ExitStatus)
+    def _on_service_step_finished(self, exit_code: int, exit_status: QtCore.QProcess.ExitStatus):
+        self.log.append_line(f"Exit code: {exit_code}")
+        if exit_code != 0 or exit_status == QtCore.QProcess.ExitStatus.CrashExit:
+            self._service_ok = False
+        self._service_proc.deleteLater()
+        self._start_next_service_step()
+
+    @QtCore.Slot(QtCore.QProcess.ProcessError)
+    def _on_service_error(self, error: QtCore.QProcess.ProcessError):
+        # finished is never emitted for a process that failed to start
+        if error != QtCore.QProcess.ProcessError.FailedToStart:
+            return
+        self.log.append_line(f"Failed to start: {self._service_proc.errorString()}")
+        self._service_ok = False
+        self._service_proc.deleteLater()
+        self._start_next_service_step()
 
     def on_reset_all(self):
         if not IS_WINDOWS:
@@ -390,49 +1127,44 @@ class MainWindow(QtWidgets.QMainWindow):
                                           "Resetting devices requires Administrator privileges.\nClick 'Run as Administrator' and try again.")
             self.update_chip()
             return
+        if self._reset_worker is not None:
+            return
         self.btn_reset_all.setEnabled(False)
         self.log.append_line("=== Resetting ALL audio devices ===")
-        devices, err = list_audio_devices()
-        if err:
-            self.log.append_line(err)
-            self.btn_reset_all.setEnabled(True)
-            return
-        if not devices:
-            self.log.append_line("No audio devices found.")
-            self.btn_reset_all.setEnabled(True)
-            return
-
-        for d in devices:
-            name = d.get("Name", "(unnamed)")
-            inst = d.get("InstanceId", "")
-            self.log.append_line(f"[{name}]")
-            self.log.append_line(f"  InstanceId: {inst}")
-            ok, out = reset_device(inst)
-            for line in out.splitlines():
-                self.log.append_line("  " + line)
-            self.log.append_line(f"  Result: {'OK' if ok else 'FAILED'}\n")
-            QtWidgets.QApplication.processEvents()
+        self._reset_worker = ResetAllWorker(self.list_audio_devices_cached(), self)
+        self._reset_worker.log_line.connect(self.log.append_line)
+        self._reset_worker.finished.connect(self._on_reset_all_finished)
+        self._reset_worker.finished.connect(self._reset_worker.deleteLater)
+        self._reset_worker.start()
 
-        self.log.append_line("=== Reset ALL finished ===\n")
+    @QtCore.Slot()
+    def _on_reset_all_finished(self):
+        self._reset_worker = None
         self.btn_reset_all.setEnabled(True)
         self.update_chip()
-if IS_WINDOWS and not is_admin():
-    import ctypes
-    params = " ".join([f'"{a}"' for a in sys.argv])
-    try:
-        ctypes.windll.shell32.ShellExecuteW(
-            None, "runas", sys.executable.replace("python.exe", "pythonw.exe"), params, None, 1
-        )
-        sys.exit(0)  # Exit the non-admin instance
-    except Exception as e:
-        from PySide6 import QtWidgets
-        QtWidgets.QMessageBox.critical(None, "Elevation failed", str(e))
-        sys.exit(1)
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        # A QThread must not be destroyed with its parent while still running
+        for worker in (self._pnp_worker, self._reset_worker, self._service_worker):
+            if worker is not None:
+                worker.wait()
+        self.sfc_tab.stop_and_wait()
+        shutdown_powershell_host()
+        super().closeEvent(event)
 
 def main():
+    # Elevate before QApplication exists so the non-admin instance never pays for Qt start-up
+    if IS_WINDOWS and not is_admin() and NO_ELEVATE_FLAG not in sys.argv:
+        try:
+            if _relaunch_elevated(sys.executable.replace("python.exe", "pythonw.exe")):
+                sys.exit(0)  # Exit the non-admin instance
+        except OSError:
+            pass
+        # UAC declined or unavailable: carry on unelevated, the toolbar still offers "Run as Administrator"
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationDisplayName(APP_TITLE)
     app.setFont(QtGui.QFont("Segoe UI", 10))
+    install_stylesheet(app)
     win = MainWindow()
     win.show()
     sys.exit(app.exec())
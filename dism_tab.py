@@ -1,13 +1,14 @@
 # dism_tab_pro.py
 import sys
 import re
+import time
 from enum import Enum
 from functools import partial
 from PySide6 import QtCore, QtWidgets, QtGui
 
 # ---- For standalone testing if fluent_widgets is not available ----
 try:
-    from fluent_widgets import FluentButton, LogBox
+    from fluent_widgets import FluentButton, LogBox, install_stylesheet
 except ImportError:
     class FluentButton(QtWidgets.QPushButton):
         def __init__(self, text, icon=None):
@@ -17,6 +18,7 @@ except ImportError:
         def __init__(self):
             super().__init__(); self.setReadOnly(True)
         def append_line(self, text: str): self.append(text)
+    def install_stylesheet(app): pass  # the fallback widgets are unstyled
 
 # ---- Constants and Configuration ----
 class DismMode(Enum):
@@ -24,7 +26,8 @@ class DismMode(Enum):
     SCAN_HEALTH = ("/ScanHealth", "Performs a more thorough scan for corruption.", QtWidgets.QStyle.StandardPixmap.SP_FileDialogContentsView)
     RESTORE_HEALTH = ("/RestoreHealth", "Scans and automatically repairs corruption.", QtWidgets.QStyle.StandardPixmap.SP_BrowserReload)
 
-DISM_PROGRESS_RE = re.compile(r"\[.*?(\d{1,3}\.\d)%.*?\]")
+# DISM output is ASCII; re.ASCII keeps \d from matching the full Unicode digit set
+DISM_PROGRESS_RE = re.compile(r"\[.*?(\d{1,3}\.\d)%.*?\]", re.ASCII)
 
 # ---- Main DISM Tab Widget ----
 class DISMTab(QtWidgets.QWidget):
@@ -35,6 +38,8 @@ class DISMTab(QtWidgets.QWidget):
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
         self.process: QtCore.QProcess | None = None
+        self._stdout_buf = bytearray()  # trailing partial line between reads
+        self._last_progress_ts = 0.0
         self.buttons: list[QtWidgets.QPushButton] = []
         self._init_ui()
         self._connect_signals()
@@ -95,6 +100,8 @@ class DISMTab(QtWidgets.QWidget):
         self.log.append_line(f"Starting 'dism {' '.join(full_args)}'...\n")
         
         self.progress.setValue(0)
+        self._stdout_buf.clear()
+        self._last_progress_ts = 0.0
         if mode is not DismMode.CHECK_HEALTH:
             self.progress.setRange(0, 0)
 
@@ -109,29 +116,50 @@ class DISMTab(QtWidgets.QWidget):
     @QtCore.Slot()
     def on_ready_read(self) -> None:
         if not self.process: return
+
+        buf = self._stdout_buf
+        buf += self.process.readAllStandardOutput().data()
+        # DISM redraws its progress bar with a bare '\r', so that ends a line too
+        cut = max(buf.rfind(b'\n'), buf.rfind(b'\r'))
+        if cut < 0: return
+        complete = bytes(buf[:cut])
+        del buf[:cut + 1]
+        for raw in complete.replace(b'\r', b'\n').split(b'\n'):
+            raw = raw.strip()
+            if raw:
+                self._handle_line(raw.decode('utf-8', errors='ignore'))
+
+    def _handle_line(self, clean_line: str) -> None:
+        # <<< FIX: Use append_line() to log output
+        self.log.append_line(clean_line)
+
+        # Most lines carry no percentage; skip the regex for them
+        if '%' in clean_line and (match := DISM_PROGRESS_RE.search(clean_line)):
+            if self.progress.minimum() == 0 and self.progress.maximum() == 0:
+                self.progress.setRange(0, 100)
             
-        output = self.process.readAllStandardOutput().data().decode('utf-8', errors='ignore')
-        for line in output.strip().splitlines():
-            clean_line = line.strip()
-            if not clean_line: continue
-            
-            # <<< FIX: Use append_line() to log output
-            self.log.append_line(clean_line)
-            
-            match = DISM_PROGRESS_RE.search(clean_line)
-            if match:
-                if self.progress.minimum() == 0 and self.progress.maximum() == 0:
-                    self.progress.setRange(0, 100)
-                
-                pct = int(float(match.group(1)))
-                if pct > self.progress.value():
-                    self.progress_animation.stop()
-                    self.progress_animation.setStartValue(self.progress.value())
+            pct = int(float(match.group(1)))
+            current = self.progress.value()
+            if pct > current:
+                now = time.monotonic()
+                self.progress_animation.stop()
+                # Tween only big or spaced-out jumps; DISM's rapid small steps would
+                # restart the 300 ms animation before it ever finishes
+                if pct - current >= 5 or now - self._last_progress_ts > 0.3:
+                    self.progress_animation.setStartValue(current)
                     self.progress_animation.setEndValue(pct)
                     self.progress_animation.start()
+                else:
+                    self.progress.setValue(pct)
+                self._last_progress_ts = now
 
     @QtCore.Slot(int, QtCore.QProcess.ExitStatus)
     def on_finished(self, exit_code: int, exit_status: QtCore.QProcess.ExitStatus) -> None:
+        # Flush a last line that arrived without a terminator
+        tail = bytes(self._stdout_buf).strip()
+        self._stdout_buf.clear()
+        if tail:
+            self._handle_line(tail.decode('utf-8', errors='ignore'))
         self.progress.setRange(0, 100)
 
         # <<< FIX: Use append_line() for final status messages
@@ -169,6 +197,7 @@ class DISMTab(QtWidgets.QWidget):
 # --- For standalone testing ---
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
+    install_stylesheet(app)
     window = DISMTab()
     window.resize(800, 600)
     window.show()
@@ -1,48 +1,102 @@
 from PySide6 import QtCore, QtGui, QtWidgets
 
+_ICON_CACHE: dict[QtWidgets.QStyle.StandardPixmap, QtGui.QIcon] = {}
+
+def standard_icon(pixmap: QtWidgets.QStyle.StandardPixmap) -> QtGui.QIcon:
+    """Application style icon, looked up once per pixmap. Needs a QApplication."""
+    icon = _ICON_CACHE.get(pixmap)
+    if icon is None:
+        icon = _ICON_CACHE[pixmap] = QtWidgets.QApplication.style().standardIcon(pixmap)
+    return icon
+
+# Installed once on the QApplication (see install_stylesheet); widgets only carry object names
+APP_STYLESHEET = """
+    QPushButton#FluentButton {
+        background: rgba(0,0,0,0.04);
+        border: 1px solid rgba(0,0,0,0.08);
+        border-radius: 12px;
+        padding: 8px 14px;
+        font-size: 12.5pt;
+    }
+    QPushButton#FluentButton:hover { background: rgba(0,0,0,0.07); }
+    QPushButton#FluentButton:pressed { background: rgba(0,0,0,0.12); }
+    QPushButton#FluentButton:disabled {
+        background: rgba(0,0,0,0.02);
+        color: rgba(0,0,0,0.4);
+    }
+    QPlainTextEdit#LogBox {
+        background: rgba(255,255,255,0.7);
+        border: 1px solid rgba(0,0,0,0.08);
+        border-radius: 12px;
+        padding: 10px;
+        font: 10.5pt "Consolas";
+    }
+"""
+
+def install_stylesheet(app: QtWidgets.QApplication) -> None:
+    """Append APP_STYLESHEET to the application's stylesheet, keeping anything already set."""
+    current = app.styleSheet()
+    if APP_STYLESHEET not in current:
+        app.setStyleSheet(current + APP_STYLESHEET)
+
 class FluentButton(QtWidgets.QPushButton):
     def __init__(self, text="", icon: QtGui.QIcon | None = None, *args, **kwargs):
         if icon:
             super().__init__(icon, text, *args, **kwargs)
         else:
             super().__init__(text, *args, **kwargs)
+        self.setObjectName("FluentButton")
         self.setCursor(QtCore.Qt.PointingHandCursor)
         self.setMinimumHeight(40)
-        self.setStyleSheet("""
-            QPushButton {
-                background: rgba(0,0,0,0.04);
-                border: 1px solid rgba(0,0,0,0.08);
-                border-radius: 12px;
-                padding: 8px 14px;
-                font-size: 12.5pt;
-            }
-            QPushButton:hover { background: rgba(0,0,0,0.07); }
-            QPushButton:pressed { background: rgba(0,0,0,0.12); }
-            QPushButton:disabled {
-                background: rgba(0,0,0,0.02);
-                color: rgba(0,0,0,0.4);
-            }
-        """)
 
 class LogBox(QtWidgets.QPlainTextEdit):
-    def __init__(self):
+    MAX_BLOCKS = 5000  # oldest lines are dropped past this, bounding memory and layout cost
+
+    def __init__(self, max_blocks: int = MAX_BLOCKS, wrap: bool = True):
         super().__init__()
         self.setReadOnly(True)
-        self.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.WidgetWidth)
-        self.setStyleSheet("""
-            QPlainTextEdit {
-                background: rgba(255,255,255,0.7);
-                border: 1px solid rgba(0,0,0,0.08);
-                border-radius: 12px;
-                padding: 10px;
-                font: 10.5pt "Consolas";
-            }
-        """)
+        self.setMaximumBlockCount(max_blocks)
+        # An undo stack would keep every trimmed block alive; nothing here is editable anyway
+        self.setUndoRedoEnabled(False)
+        self.setCenterOnScroll(False)
+        self.setCursorWidth(0)  # read-only: no caret to blink and repaint
+        self.setObjectName("LogBox")
+        # wrap=False skips re-wrapping on every append/resize, for logs of short lines
+        self.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.WidgetWidth if wrap
+                             else QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
         self._last_line = None  # store last printed line
+        # Lines are batched and written once per ~50 ms, so a burst of output
+        # costs one document update and one scroll instead of one per line
+        self._pending: list[str] = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush)
+        # Writes go straight into the document at its end, independent of the view's cursor
+        self._cursor = QtGui.QTextCursor(self.document())
 
     def append_line(self, text: str):
         if text == self._last_line:
             return  # skip duplicate
         self._last_line = text
-        self.appendPlainText(text)
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
\ No newline at end of file
+        self._pending.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def clear(self):
+        self._pending.clear()
+        super().clear()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        sb = self.verticalScrollBar()
+        at_bottom = sb.value() >= sb.maximum() - 4
+        text = "\n".join(self._pending)
+        self._pending.clear()
+        self._cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        # Leading rather than trailing newline, so the document never ends in an empty block
+        self._cursor.insertText(text if self.document().isEmpty() else "\n" + text)
+        # Follow the output only if the user hasn't scrolled up to read something
+        if at_bottom:
+            sb.setValue(sb.maximum())
\ No newline at end of file
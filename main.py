@@ -3,6 +3,7 @@ import sys
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from main_window import MainWindow
+from fluent_widgets import install_stylesheet
 from core.utils import IS_WINDOWS, ensure_admin_elevated
 
 def main():
@@ -11,6 +12,7 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationDisplayName("")
     app.setFont(QtGui.QFont("Segoe UI", 10))
+    install_stylesheet(app)
 
     # Optional: auto elevation (same behavior you had)
     if IS_WINDOWS:
@@ -11,6 +11,10 @@ from tabs.dism_tab import DISMTab
 
 APP_TITLE = "Windows Toolbox"
 
+def _picker_tab():
+    from tabs.picker_tab import PickerHostTab
+    return PickerHostTab()
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -23,25 +27,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tabs = QtWidgets.QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Tabs
+        # Tabs: only the first page is built up front. The others start as empty
+        # placeholders and are constructed the first time they are selected.
         self.audio_tab = AudioTab()
         self.tabs.addTab(self.audio_tab, "Audio Manager")
 
-        self.sfc_tab = SFCTab()
-        self.tabs.addTab(self.sfc_tab, "SFC /SCANNOW")
-
-        self.dism_tab = DISMTab()
-        self.tabs.addTab(self.dism_tab, "DISM Tools")
-
-        self.port_tab = PortTab()
-        self.tabs.addTab(self.port_tab, "Port option")
-
-
-        from tabs.picker_tab import PickerHostTab
-
-        # ...
-        self.picker_tab = PickerHostTab()
-        self.tabs.addTab(self.picker_tab, "PickerHost")
+        self.sfc_tab = self.dism_tab = self.port_tab = self.picker_tab = None
+        self._tab_factories = {}
+        for label, attr, factory in (
+            ("SFC /SCANNOW", "sfc_tab", SFCTab),
+            ("DISM Tools", "dism_tab", DISMTab),
+            ("Port option", "port_tab", PortTab),
+            ("PickerHost", "picker_tab", _picker_tab),
+        ):
+            index = self.tabs.addTab(QtWidgets.QWidget(), label)
+            self._tab_factories[index] = (label, attr, factory)
+        self.tabs.currentChanged.connect(self._ensure_tab)
 
         # ---- Status bar
         self.status = self.statusBar()
@@ -57,14 +58,35 @@ class MainWindow(QtWidgets.QMainWindow):
         # ---- Menu bar (File/Tools/Help)
         self._build_menu()
 
-        # ---- Theme & background (Mica best-effort)
+        # ---- Theme (before the first paint, so there is no palette flash)
         self._apply_palette()
+
+        # main() shows the window; Mica and the first data load run once the
+        # event loop is up, after that first paint
+        QtCore.QTimer.singleShot(0, self._post_show_init)
+
+    def _post_show_init(self):
+        # ---- Background (Mica best-effort)
         if IS_WINDOWS:
-            self.show()
             QtCore.QTimer.singleShot(150, lambda: try_enable_mica(self.winId()))
-
-        # Initial data load
-        self.audio_tab.refresh()
+        # Initial data load, queued so it runs between event-loop iterations
+        QtCore.QTimer.singleShot(0, self.audio_tab.refresh)
+
+    def _ensure_tab(self, index: int):
+        entry = self._tab_factories.pop(index, None)
+        if entry is None:
+            return
+        label, attr, factory = entry
+        widget = factory()
+        setattr(self, attr, widget)
+        placeholder = self.tabs.widget(index)
+        # removeTab/insertTab move the current index; don't re-enter from currentChanged
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, widget, label)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
 
     def _build_menu(self):
         mb = self.menuBar()
@@ -1,9 +1,14 @@
-# sfc_tab_pro_animated.py
-import sys
+# sfc_tab.py
 import re
 from enum import Enum
 from PySide6 import QtCore, QtWidgets, QtGui
 
+try:
+    from fluent_widgets import standard_icon
+except ImportError:
+    def standard_icon(pixmap: QtWidgets.QStyle.StandardPixmap) -> QtGui.QIcon:
+        return QtWidgets.QApplication.style().standardIcon(pixmap)
+
 # ---- Constants and Configuration ----
 class SfcMode(Enum):
     SCAN_NOW = ("/scannow", "Finds and repairs corrupt system files.")
@@ -12,21 +17,139 @@ class SfcMode(Enum):
     def __str__(self):
         return self.name.replace('_', ' ').title()
 
-PROGRESS_RE = re.compile(r"(\d{1,3})%")
+# Fixed log messages, pre-encoded for the byte-oriented log queue
+_MSG_CANCELLED = b"\n=== SCAN CANCELLED BY USER ==="
+_MSG_CRASH = b"\n=== SCAN FAILED: The process crashed. ==="
+_MSG_OK = b"\n=== SCAN COMPLETE: No integrity violations found. ==="
+_MSG_CODE_FMT = "\n=== SCAN FINISHED (Code: {}): Check logs for details. ==="
+
+# Matched against the raw pipe bytes, before any decoding
+PROGRESS_RE = re.compile(rb"(\d{1,3})%")
+
+# ---- SFC process runner (worker thread) ----
+class SfcRunner(QtCore.QObject):
+    """
+    Owns the sfc QProcess on a worker thread. Output is read, split and parsed
+    there, and handed to the UI as one batch per BATCH_MS instead of one slot
+    call per read.
+    """
+    BATCH_MS = 100
+    batched_output = QtCore.Signal(object, int)  # joined raw lines (bytes), latest percent or -1
+    done = QtCore.Signal(int, bool)              # exit code, crashed / failed to start
+
+    def __init__(self, command: str) -> None:
+        super().__init__()
+        self._command = command
+        self.process: QtCore.QProcess | None = None
+        self._timer: QtCore.QTimer | None = None
+        self._stdout_buf = bytearray()  # trailing partial line between reads
+        self._lines: list[bytes] = []
+        self._pct = -1
+        self._last_emitted_pct = -1
+
+    @QtCore.Slot()
+    def start(self) -> None:
+        # Created here, not in __init__, so both belong to the worker thread
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.BATCH_MS)
+        self._timer.timeout.connect(self._emit_batch)
+        self.process = QtCore.QProcess(self)
+        self.process.setProcessChannelMode(QtCore.QProcess.ProcessChannelMode.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self._on_ready_read)
+        self.process.finished.connect(self._on_finished)
+        self.process.errorOccurred.connect(self._on_error)
+        self._timer.start()
+        self.process.start("sfc", [self._command])
+
+    @QtCore.Slot()
+    def stop(self) -> None:
+        if self.process and self.process.state() != QtCore.QProcess.ProcessState.NotRunning:
+            self.process.kill()
+
+    @QtCore.Slot()
+    def _on_ready_read(self) -> None:
+        buf = self._stdout_buf
+        start = len(buf)  # the kept tail holds no line break, so only new bytes are searched
+        buf += self.process.readAllStandardOutput().data()
+        # A read can end mid-line (or mid-character); only complete lines are handled,
+        # the tail waits for the next read. SFC redraws its percentage with a bare '\r',
+        # so that ends a line too
+        cut = max(buf.rfind(b'\n', start), buf.rfind(b'\r', start))
+        if cut < 0:
+            return
+        complete = bytes(buf[:cut])
+        del buf[:cut + 1]
+        for raw in complete.splitlines():
+            self._handle_line(raw)
+
+    def _handle_line(self, raw: bytes) -> None:
+        raw = raw.strip()
+        if not raw:
+            return
+        self._lines.append(raw)
+        # Most lines carry no percentage; skip the regex for them
+        if b'%' in raw and (match := PROGRESS_RE.search(raw)):
+            self._pct = int(match.group(1))
+
+    @QtCore.Slot()
+    def _emit_batch(self) -> None:
+        # SFC repeats the same percentage for long stretches; only send changes
+        pct = self._pct if self._pct != self._last_emitted_pct else -1
+        self._pct = -1
+        if not self._lines and pct < 0:
+            return
+        if pct >= 0:
+            self._last_emitted_pct = pct
+        lines, self._lines = self._lines, []
+        self.batched_output.emit(b"\n".join(lines), pct)
+
+    def _finish(self, exit_code: int, crashed: bool) -> None:
+        # Flush a last line that arrived without a terminator
+        tail = bytes(self._stdout_buf)
+        self._stdout_buf.clear()
+        self._handle_line(tail)
+        self._timer.stop()
+        self._emit_batch()
+        self.done.emit(exit_code, crashed)
+
+    @QtCore.Slot(int, QtCore.QProcess.ExitStatus)
+    def _on_finished(self, exit_code: int, exit_status: QtCore.QProcess.ExitStatus) -> None:
+        self._finish(exit_code, exit_status == QtCore.QProcess.ExitStatus.CrashExit)
+
+    @QtCore.Slot(QtCore.QProcess.ProcessError)
+    def _on_error(self, error: QtCore.QProcess.ProcessError) -> None:
+        # finished is never emitted for a process that failed to start
+        if error == QtCore.QProcess.ProcessError.FailedToStart:
+            self._finish(-1, True)
 
 # ---- Main SFC Tab Widget ----
 class SFCTab(QtWidgets.QWidget):
     """
     An advanced widget to run and monitor Windows System File Checker (SFC).
-    It uses QProcess for robust, non-blocking execution and provides
-    an animated progress bar for a smoother user experience.
+    The process runs in an SfcRunner on its own thread, and this widget only
+    applies the batches it sends. The progress bar is animated for a smoother
+    user experience.
     """
+    _stop_requested = QtCore.Signal()
+
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
-        self.process: QtCore.QProcess | None = None
+        self._runner: SfcRunner | None = None
+        self._thread: QtCore.QThread | None = None
+        self._last_anim_target = -1
+        # Output is queued here and written to the log once per ~50 ms tick
+        # Raw bytes, so process output is decoded once per flush rather than once per line
+        self._log_buffer: list[bytes] = []
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
         self._init_ui()
         self._connect_signals()
         self.setWindowTitle("SFC Utility")
+        # An embedded tab never gets closeEvent, so also join the scan thread on quit
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_and_wait)
 
     def _init_ui(self) -> None:
         """Initializes the user interface components."""
@@ -41,7 +164,7 @@ class SFCTab(QtWidgets.QWidget):
 
         # --- Run Button ---
         self.btn_run = QtWidgets.QPushButton("Start Scan")
-        self.btn_run.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+        self.btn_run.setIcon(standard_icon(QtWidgets.QStyle.SP_MediaPlay))
         
         controls_layout.addWidget(QtWidgets.QLabel("Mode:"))
         controls_layout.addWidget(self.mode_combo, 1)
@@ -58,11 +181,15 @@ class SFCTab(QtWidgets.QWidget):
         self.progress_animation.setDuration(250) # Animate over 250ms
         self.progress_animation.setEasingCurve(QtCore.QEasingCurve.Type.InOutQuad)
 
-        self.log = QtWidgets.QTextEdit()
+        # Plain text only: QPlainTextEdit appends a block without rich-text reflow
+        self.log = QtWidgets.QPlainTextEdit()
         self.log.setReadOnly(True)
+        self.log.setUndoRedoEnabled(False)
+        self.log.setMaximumBlockCount(5000)  # same bound as LogBox
+        self.log.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
         self.log.setFont(QtGui.QFont("Consolas", 10))
-        self.log.append("Select a scan mode and press 'Start Scan'.\n"
-                        "NOTE: This tool must be run with administrator privileges.\n")
+        self.log.appendPlainText("Select a scan mode and press 'Start Scan'.\n"
+                                 "NOTE: This tool must be run with administrator privileges.\n")
 
         main_layout.addLayout(controls_layout)
         main_layout.addWidget(self.progress)
@@ -70,88 +197,130 @@ class SFCTab(QtWidgets.QWidget):
 
     def _connect_signals(self) -> None:
         self.btn_run.clicked.connect(self.toggle_scan)
+        self._log_timer.timeout.connect(self._flush_log)
+
+    def _log(self, text: str) -> None:
+        """Queue a status message; it shares the output queue so ordering is kept."""
+        self._log_raw(text.encode('utf-8'))
+
+    def _log_raw(self, raw: bytes) -> None:
+        self._log_buffer.append(raw)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    @QtCore.Slot()
+    def _flush_log(self) -> None:
+        if not self._log_buffer:
+            return
+        batch, self._log_buffer = self._log_buffer, []
+        sb = self.log.verticalScrollBar()
+        at_bottom = sb.value() >= sb.maximum() - 4
+        self.log.appendPlainText(b"\n".join(batch).decode('utf-8', errors='ignore'))
+        # Follow the output only if the user hasn't scrolled up to read something
+        if at_bottom:
+            sb.setValue(sb.maximum())
 
     def _update_ui_state(self, is_running: bool) -> None:
         self.mode_combo.setEnabled(not is_running)
         if is_running:
             self.btn_run.setText("Cancel Scan")
-            self.btn_run.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaStop))
+            self.btn_run.setIcon(standard_icon(QtWidgets.QStyle.SP_MediaStop))
         else:
             self.btn_run.setText("Start Scan")
-            self.btn_run.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay))
+            self.btn_run.setIcon(standard_icon(QtWidgets.QStyle.SP_MediaPlay))
 
     @QtCore.Slot()
     def toggle_scan(self) -> None:
-        if self.process and self.process.state() != QtCore.QProcess.ProcessState.NotRunning:
-            self.process.kill()
-            self.log.append("\n=== SCAN CANCELLED BY USER ===")
+        if self._runner is not None:
+            self._stop_requested.emit()
+            self._log_raw(_MSG_CANCELLED)
             return
 
+        if self._thread is not None:
+            self._thread.wait()  # previous run already asked it to quit
+        self._log_buffer.clear()
         self.log.clear()
         selected_mode: SfcMode = self.mode_combo.currentData()
         command, _ = selected_mode.value
-        self.log.append(f"Starting 'sfc {command}'...")
+        self._log(f"Starting 'sfc {command}'...")
         
         self.progress.setValue(0) # Reset instantly
+        self._last_anim_target = -1
         self.progress.setRange(0, 0)
         self._update_ui_state(is_running=True)
 
-        self.process = QtCore.QProcess()
-        self.process.setProcessChannelMode(QtCore.QProcess.ProcessChannelMode.MergedChannels)
-        self.process.readyReadStandardOutput.connect(self.on_ready_read)
-        self.process.finished.connect(self.on_finished)
-        self.process.start("sfc", [command])
+        thread = QtCore.QThread(self)
+        runner = SfcRunner(command)
+        runner.moveToThread(thread)
+        thread.started.connect(runner.start)
+        self._stop_requested.connect(runner.stop)
+        runner.batched_output.connect(self.on_batch)
+        runner.done.connect(self.on_finished)
+        # Direct: quit() is thread-safe, and closeEvent may be waiting without an event loop
+        runner.done.connect(thread.quit, QtCore.Qt.ConnectionType.DirectConnection)
+        thread.finished.connect(self._on_thread_finished)
+        thread.finished.connect(runner.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._runner, self._thread = runner, thread
+        thread.start()
 
-    @QtCore.Slot()
-    def on_ready_read(self) -> None:
-        if not self.process:
+    @QtCore.Slot(object, int)
+    def on_batch(self, data: bytes, pct: int) -> None:
+        if data:
+            self._log_raw(data)
+            self._flush_log()
+        if pct < 0:
             return
-            
-        output = self.process.readAllStandardOutput().data().decode('utf-8', errors='ignore')
-        for line in output.strip().splitlines():
-            clean_line = line.strip()
-            if not clean_line:
-                continue
-            
-            self.log.append(clean_line)
-            
-            match = PROGRESS_RE.search(clean_line)
-            if match:
-                if self.progress.minimum() == 0 and self.progress.maximum() == 0:
-                    self.progress.setRange(0, 100)
-                
-                pct = int(match.group(1))
-
-                # <<< CHANGE: Instead of setValue, run the animation
-                # Only animate if the new value is greater to avoid backward animation
-                if pct > self.progress.value():
-                    self.progress_animation.stop() # Stop previous animation if any
-                    self.progress_animation.setStartValue(self.progress.value())
-                    self.progress_animation.setEndValue(pct)
-                    self.progress_animation.start()
+        if self.progress.minimum() == 0 and self.progress.maximum() == 0:
+            self.progress.setRange(0, 100)
 
-    @QtCore.Slot(int, QtCore.QProcess.ExitStatus)
-    def on_finished(self, exit_code: int, exit_status: QtCore.QProcess.ExitStatus) -> None:
-        if exit_status == QtCore.QProcess.ExitStatus.CrashExit:
-            self.log.append("\n=== SCAN FAILED: The process crashed. ===")
+        # Only move forward. Restarting the tween on every tick would keep it
+        # repainting for the whole scan, so only jumps of 5%+ are animated
+        if pct > self.progress.value():
+            self.progress_animation.stop() # Stop previous animation if any
+            if pct - self._last_anim_target >= 5:
+                self.progress_animation.setStartValue(self.progress.value())
+                self.progress_animation.setEndValue(pct)
+                self.progress_animation.start()
+                self._last_anim_target = pct
+            else:
+                self.progress.setValue(pct)
+
+    @QtCore.Slot(int, bool)
+    def on_finished(self, exit_code: int, crashed: bool) -> None:
+        if crashed:
+            self._log_raw(_MSG_CRASH)
         elif exit_code == 0:
-            self.log.append("\n=== SCAN COMPLETE: No integrity violations found. ===")
+            self._log_raw(_MSG_OK)
         else:
-            self.log.append(f"\n=== SCAN FINISHED (Code: {exit_code}): Check logs for details. ===")
+            self._log(_MSG_CODE_FMT.format(exit_code))
         
-        # <<< CHANGE: Animate the final jump to 100% for a consistent feel
+        self.progress_animation.stop()
         self.progress.setRange(0, 100)
-        if self.progress.value() < 100 and exit_code == 0:
-            self.progress_animation.stop()
-            self.progress_animation.setStartValue(self.progress.value())
-            self.progress_animation.setEndValue(100)
-            self.progress_animation.start()
+        if exit_code == 0:
+            self.progress.setValue(100)
         
         self._update_ui_state(is_running=False)
-        self.process = None
+        # Don't touch the runner here: thread.finished -> deleteLater may already have run.
+        # Its _stop_requested connection goes away with it
+        self._runner = None  # _thread is kept until it has actually finished
+
+    @QtCore.Slot()
+    def _on_thread_finished(self) -> None:
+        if self._thread is not None and self._thread.isFinished():
+            self._thread = None
+
+    @QtCore.Slot()
+    def stop_and_wait(self, timeout_ms: int = 5000) -> None:
+        """Kill a running scan and join its thread; a QThread must not be destroyed while running."""
+        if self._thread is None:
+            return
+        if self._runner is not None:
+            self._stop_requested.emit()
+        self._thread.wait(timeout_ms)
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        if self.process and self.process.state() != QtCore.QProcess.ProcessState.NotRunning:
+        if self._runner is not None:
             reply = QtWidgets.QMessageBox.question(
                 self,
                 "Scan in Progress",
@@ -160,7 +329,7 @@ class SFCTab(QtWidgets.QWidget):
                 QtWidgets.QMessageBox.StandardButton.No,
             )
             if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-                self.process.kill()
+                self.stop_and_wait()
                 event.accept()
             else:
                 event.ignore()
@@ -169,6 +338,8 @@ class SFCTab(QtWidgets.QWidget):
 
 # --- For standalone testing ---
 if __name__ == "__main__":
+    import sys  # only the standalone runner needs it
+
     app = QtWidgets.QApplication(sys.argv)
     window = SFCTab()
     window.resize(600, 400)